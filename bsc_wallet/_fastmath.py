@@ -0,0 +1,51 @@
+"""
+Fast Math Module
+Bulk conversion of token amounts to raw integer units, JIT-compiled with
+Numba when numba and numpy are installed
+"""
+
+from typing import List, Sequence
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+# Raw amounts at or above this do not fit the int64 kernel
+_INT64_LIMIT = float(2 ** 63)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _amounts_to_raw_int64(amounts, scale):
+        out = np.empty(amounts.size, dtype=np.int64)
+        for i in range(amounts.size):
+            out[i] = np.int64(amounts[i] * scale)
+        return out
+
+
+def amounts_to_raw(amounts: Sequence[float], decimals: int) -> List[int]:
+    """
+    Convert human-readable token amounts to raw integer units
+    
+    Each result equals int(amount * 10 ** decimals). With Numba installed
+    the loop runs compiled; amounts whose raw value would overflow int64
+    (e.g. 10+ tokens at 18 decimals) use the pure Python path instead.
+    
+    Args:
+        amounts: Token amounts (list or numpy array of floats)
+        decimals: Token decimals
+    
+    Returns:
+        Raw amounts as Python ints
+    """
+    scale = float(10 ** decimals)
+    
+    if njit is not None and len(amounts) > 0:
+        values = np.asarray(amounts, dtype=np.float64)
+        if np.abs(values).max() * scale < _INT64_LIMIT:
+            return _amounts_to_raw_int64(values, scale).tolist()
+    
+    return [int(amount * scale) for amount in amounts]
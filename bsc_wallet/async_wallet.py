@@ -0,0 +1,559 @@
+"""
+Async Wallet Module
+AsyncWeb3 versions of BNB transfers and balance lookups that run
+independent RPC calls concurrently
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Sequence, Union
+from web3 import AsyncWeb3
+from web3.exceptions import TimeExhausted
+from eth_account.signers.local import LocalAccount
+from .config import (
+    BSC_TESTNET_RPC_URL,
+    BSC_TESTNET_CHAIN_ID,
+    DEFAULT_GAS_LIMIT,
+    DEFAULT_GAS_PRICE,
+    TOKEN_TRANSFER_GAS_LIMIT,
+    BSC_TESTNET_EXPLORER,
+    ERC20_ABI,
+    SAMPLE_TOKENS,
+    CONFIRMATION_TIMEOUT,
+    CONFIRMATION_POLL_LATENCY,
+    HTTP_POOL_SIZE,
+    BROADCAST_CONCURRENCY,
+    USE_EIP1559,
+    FEE_HISTORY_BLOCKS,
+    FEE_HISTORY_PERCENTILES,
+    FEE_HISTORY_CACHE_TTL
+)
+from .rpc import create_async_web3, endpoint_of, send_raw_transaction_async
+from .utils import is_address, to_checksum_address, resolve_account
+from .bnb_transfer import base_and_priority_fee, broadcast_error, insufficient_balance_error
+from .token_transfer import encode_transfer, _check_amount_raw
+from .signing import BatchSigner
+from ._fastmath import amounts_to_raw
+
+logger = logging.getLogger(__name__)
+
+
+async def _call_or_default(contract_function, default):
+    """
+    Call a contract view function, returning a default on failure
+    
+    Args:
+        contract_function: Bound async contract function
+        default: Value returned when the call fails
+    
+    Returns:
+        Call result or default
+    """
+    try:
+        return await contract_function.call()
+    except Exception:
+        return default
+
+
+class AsyncBNBTransfer:
+    """
+    Handles BNB transfers on BSC Testnet using AsyncWeb3
+    """
+    
+    def __init__(self, rpc_url: str = BSC_TESTNET_RPC_URL, web3: Optional[AsyncWeb3] = None,
+                 use_eip1559: bool = USE_EIP1559):
+        """
+        Initialize async BNB transfer handler
+        
+        Args:
+            rpc_url: BSC Testnet HTTP(S) RPC URL
+            web3: Shared AsyncWeb3 instance (optional, rpc_url is ignored when given)
+            use_eip1559: Build dynamic-fee (type 2) transactions instead of legacy gasPrice ones
+        """
+        self.web3 = web3 if web3 is not None else create_async_web3(rpc_url)
+        self.chain_id = BSC_TESTNET_CHAIN_ID
+        self.use_eip1559 = use_eip1559
+        
+        # (fetched_at, fees) from the last eth_feeHistory call
+        self._fee_cache = (0.0, None)
+        
+        logger.info("Async BNB transfer handler using: %s", endpoint_of(self.web3))
+    
+    async def get_balance(self, address: str) -> Dict[str, float]:
+        """
+        Get BNB balance for an address
+        
+        Args:
+            address: Wallet address
+        
+        Returns:
+            Dict with balance in wei and BNB
+        """
+        try:
+            if not is_address(address):
+                raise ValueError("Invalid address format")
+            
+            checksum_address = to_checksum_address(address)
+            balance_wei = await self.web3.eth.get_balance(checksum_address)
+            balance_bnb = self.web3.from_wei(balance_wei, 'ether')
+            
+            logger.info("Balance for %s: %s BNB", checksum_address, balance_bnb)
+            return {
+                "address": checksum_address,
+                "balance_wei": balance_wei,
+                "balance_bnb": float(balance_bnb)
+            }
+        
+        except Exception as e:
+            logger.error("Error getting balance: %s", e)
+            raise
+    
+    async def estimate_gas_price(self) -> int:
+        """
+        Get current gas price from the network
+        
+        Returns:
+            Gas price in wei
+        """
+        try:
+            return await self.web3.eth.gas_price
+        except Exception as e:
+            logger.warning("Error getting gas price, using default: %s", e)
+            return DEFAULT_GAS_PRICE
+    
+    async def estimate_fees(self) -> Dict[str, int]:
+        """
+        Estimate EIP-1559 fees from recent fee history
+        
+        Same rule as BNBTransfer.estimate_fees, cached for
+        FEE_HISTORY_CACHE_TTL seconds.
+        
+        Returns:
+            Dict with maxFeePerGas and maxPriorityFeePerGas in wei
+        """
+        fetched_at, cached_fees = self._fee_cache
+        if cached_fees and time.monotonic() - fetched_at < FEE_HISTORY_CACHE_TTL:
+            return cached_fees
+        
+        fee_history = await self.web3.eth.fee_history(FEE_HISTORY_BLOCKS, 'latest', FEE_HISTORY_PERCENTILES)
+        base_fee, priority_fee = base_and_priority_fee(fee_history)
+        
+        # Empty blocks report zero rewards; fall back to the network gas price
+        if priority_fee == 0:
+            priority_fee = max(await self.estimate_gas_price() - base_fee, 0)
+        
+        fees = {
+            'maxFeePerGas': 2 * base_fee + priority_fee,
+            'maxPriorityFeePerGas': priority_fee
+        }
+        self._fee_cache = (time.monotonic(), fees)
+        return fees
+    
+    async def _fee_fields(self) -> Dict[str, int]:
+        """
+        Fee fields for a new transfer
+        
+        Returns:
+            Dynamic-fee fields (with type 2) when use_eip1559 is set and the
+            node reports fee history, else a legacy gasPrice field
+        """
+        if self.use_eip1559:
+            try:
+                return {'type': 2, **(await self.estimate_fees())}
+            except Exception as e:
+                logger.warning("Fee history unavailable, using legacy gas price: %s", e)
+        return {'gasPrice': await self.estimate_gas_price()}
+    
+    async def wait_for_confirmation(self, tx_hash: str, timeout: int = CONFIRMATION_TIMEOUT) -> Dict:
+        """
+        Wait for transaction confirmation
+        
+        Args:
+            tx_hash: Transaction hash
+            timeout: Timeout in seconds
+        
+        Returns:
+            Transaction receipt
+        """
+        try:
+            logger.info("Waiting for confirmation of transaction: %s", tx_hash)
+            
+            start_time = time.time()
+            try:
+                receipt = await self.web3.eth.wait_for_transaction_receipt(
+                    tx_hash, timeout=timeout, poll_latency=CONFIRMATION_POLL_LATENCY
+                )
+            except TimeExhausted:
+                raise TimeoutError(f"Transaction confirmation timeout after {timeout} seconds")
+            
+            status = "Success" if receipt.status == 1 else "Failed"
+            logger.info("Transaction confirmed! Status: %s", status)
+            
+            return {
+                "tx_hash": tx_hash,
+                "status": status,
+                "gas_used": receipt.gasUsed,
+                "block_number": receipt.blockNumber,
+                "confirmation_time": time.time() - start_time
+            }
+        
+        except Exception as e:
+            logger.error("Error waiting for confirmation: %s", e)
+            raise
+    
+    async def send_bnb(self, private_key: Union[str, LocalAccount], to_address: str, amount_bnb: float,
+                       wait_for_confirmation: bool = False) -> Dict:
+        """
+        Complete BNB transfer process
+        
+        The sender balance, fees and pending nonce do not depend on each
+        other, so they are fetched concurrently. Builds a dynamic-fee
+        (type 2) transaction when use_eip1559 is set, like BNBTransfer.
+        
+        Args:
+            private_key: Sender's private key (hex string) or LocalAccount
+            to_address: Recipient address
+            amount_bnb: Amount in BNB to send
+            wait_for_confirmation: Whether to wait for confirmation
+        
+        Returns:
+            Transaction result with hash, gas used, and status
+        """
+        try:
+            account = resolve_account(private_key)
+            from_address = account.address
+            
+            if not is_address(to_address):
+                raise ValueError("Invalid to_address format")
+            to_checksum = to_checksum_address(to_address)
+            
+            logger.info("=== Async BNB Transfer: %s BNB from %s to %s ===", amount_bnb, from_address, to_checksum)
+            
+            balance_info, fee_fields, nonce = await asyncio.gather(
+                self.get_balance(from_address),
+                self._fee_fields(),
+                self.web3.eth.get_transaction_count(from_address, 'pending')
+            )
+            
+            if balance_info['balance_bnb'] < amount_bnb:
+                raise insufficient_balance_error(balance_info['balance_bnb'], amount_bnb, from_address)
+            
+            transaction = {
+                'nonce': nonce,
+                'to': to_checksum,
+                'value': self.web3.to_wei(amount_bnb, 'ether'),
+                'gas': DEFAULT_GAS_LIMIT,
+                'chainId': self.chain_id,
+                **fee_fields
+            }
+            signed_txn = account.sign_transaction(transaction)
+            
+            try:
+                tx_hash = await send_raw_transaction_async(self.web3, signed_txn.rawTransaction)
+            except Exception as e:
+                raise broadcast_error(e)
+            
+            logger.info("Transaction broadcasted with hash: %s", tx_hash)
+            
+            result = {
+                "tx_hash": tx_hash,
+                "from_address": from_address,
+                "to_address": to_address,
+                "amount_bnb": amount_bnb,
+                "explorer_url": f"{BSC_TESTNET_EXPLORER}/tx/{tx_hash}"
+            }
+            
+            if wait_for_confirmation:
+                result.update(await self.wait_for_confirmation(tx_hash))
+            
+            return result
+        
+        except Exception as e:
+            logger.error("Error in async BNB transfer: %s", e)
+            raise
+
+
+class AsyncBSCWallet:
+    """
+    AsyncWeb3 counterpart of BSCWallet for balance lookups and BNB transfers
+    """
+    
+    def __init__(self, rpc_url: Optional[str] = None, pool_size: int = HTTP_POOL_SIZE):
+        """
+        Initialize async BSC Wallet
+        
+        Args:
+            rpc_url: Custom HTTP(S) RPC URL (optional)
+            pool_size: Maximum number of RPC calls in flight at once
+        """
+        self.web3 = create_async_web3(rpc_url or BSC_TESTNET_RPC_URL)
+        self.bnb_transfer = AsyncBNBTransfer(web3=self.web3)
+        self.pool_size = pool_size
+        
+        # ERC-20 contract class bound to our AsyncWeb3; instances only add an address
+        self._erc20_factory = self.web3.eth.contract(abi=ERC20_ABI)
+        
+        # Default-ABI contract instances keyed by checksum address
+        self._token_contracts = {}
+    
+    async def get_bnb_balance(self, address: str) -> Dict[str, float]:
+        """
+        Get BNB balance for an address
+        
+        Args:
+            address: Wallet address
+        
+        Returns:
+            Dict with balance information
+        """
+        return await self.bnb_transfer.get_balance(address)
+    
+    async def get_token_balance(self, token_address: str, wallet_address: str, abi: list = None) -> Dict:
+        """
+        Get token balance for a wallet, fetching metadata and balance concurrently
+        
+        Args:
+            token_address: Token contract address
+            wallet_address: Wallet address
+            abi: Token ABI (optional)
+        
+        Returns:
+            Dict with balance information
+        """
+        try:
+            if not is_address(token_address):
+                raise ValueError("Invalid token address format")
+            if not is_address(wallet_address):
+                raise ValueError("Invalid wallet address format")
+            
+            checksum_token = to_checksum_address(token_address)
+            checksum_wallet = to_checksum_address(wallet_address)
+            if abi:
+                contract = self.web3.eth.contract(address=checksum_token, abi=abi)
+            else:
+                contract = self._token_contracts.get(checksum_token)
+                if contract is None:
+                    contract = self._erc20_factory(address=checksum_token)
+                    self._token_contracts[checksum_token] = contract
+            
+            name, symbol, decimals, balance_raw = await asyncio.gather(
+                _call_or_default(contract.functions.name(), "Unknown"),
+                _call_or_default(contract.functions.symbol(), "UNK"),
+                _call_or_default(contract.functions.decimals(), 18),
+                contract.functions.balanceOf(checksum_wallet).call()
+            )
+            
+            return {
+                "wallet_address": checksum_wallet,
+                "token_address": checksum_token,
+                "token_name": name,
+                "token_symbol": symbol,
+                "balance_raw": balance_raw,
+                "balance_formatted": balance_raw / (10 ** decimals),
+                "decimals": decimals
+            }
+        
+        except Exception as e:
+            logger.error("Error getting token balance: %s", e)
+            raise
+    
+    async def get_all_balances(self, wallet_address: str, token_addresses: List[str] = None) -> Dict:
+        """
+        Get all balances (BNB + tokens) for a wallet concurrently
+        
+        Args:
+            wallet_address: Wallet address
+            token_addresses: List of token contract addresses (optional)
+        
+        Returns:
+            Dict with all balance information
+        """
+        if token_addresses:
+            tokens = {token_address: token_address for token_address in token_addresses}
+        else:
+            tokens = dict(SAMPLE_TOKENS)
+        
+        # Cap the number of concurrent lookups at the pool size
+        semaphore = asyncio.Semaphore(self.pool_size)
+        
+        async def limited(coroutine):
+            async with semaphore:
+                return await coroutine
+        
+        results = await asyncio.gather(
+            limited(self.get_bnb_balance(wallet_address)),
+            *[limited(self.get_token_balance(token_address, wallet_address)) for token_address in tokens.values()],
+            return_exceptions=True
+        )
+        
+        result = {
+            "wallet_address": wallet_address,
+            "bnb_balance": None,
+            "token_balances": {}
+        }
+        
+        if isinstance(results[0], Exception):
+            logger.warning("Error getting BNB balance: %s", results[0])
+        else:
+            result["bnb_balance"] = results[0]
+        
+        for token_key, token_balance in zip(tokens, results[1:]):
+            if isinstance(token_balance, Exception):
+                logger.warning("Error getting balance for %s: %s", token_key, token_balance)
+            else:
+                result["token_balances"][token_key] = token_balance
+        
+        return result
+    
+    async def send_bnb(self, private_key: Union[str, LocalAccount], to_address: str, amount_bnb: float,
+                       wait_for_confirmation: bool = False) -> Dict:
+        """
+        Send BNB to another address
+        
+        Args:
+            private_key: Sender's private key (hex string) or LocalAccount
+            to_address: Recipient address
+            amount_bnb: Amount in BNB to send
+            wait_for_confirmation: Whether to wait for confirmation
+        
+        Returns:
+            Transaction result
+        """
+        return await self.bnb_transfer.send_bnb(private_key, to_address, amount_bnb, wait_for_confirmation)
+    
+    async def send_tokens_bulk_async(self, private_key: Union[str, LocalAccount], token_address: str,
+                                     recipients: List[str], amounts: Sequence[float], abi: list = None,
+                                     wait_for_confirmation: bool = False) -> List[Dict]:
+        """
+        Send one token to many recipients as a three-stage pipeline
+        
+        After one concurrent pre-flight (token info, balance, gas price and
+        pending nonce), all transfers are signed in the default thread pool,
+        broadcast concurrently with at most BROADCAST_CONCURRENCY requests in
+        flight, and, if requested, their receipts are awaited together.
+        Nonces are assigned consecutively, so transfers that reach the node
+        out of order are queued until the gap fills. If a broadcast fails,
+        every transfer with a higher nonce is reported as an error, since
+        it cannot be mined past the gap.
+        
+        Args:
+            private_key: Sender's private key (hex string) or LocalAccount
+            token_address: Token contract address
+            recipients: Recipient addresses
+            amounts: Amount of tokens for each recipient (list or numpy array)
+            abi: Token ABI (optional)
+            wait_for_confirmation: Whether to wait for all confirmations
+        
+        Returns:
+            List of transaction results in recipient order; transfers that
+            failed to broadcast, or sit behind one that did, have an "error"
+            entry instead of a tx_hash
+        """
+        try:
+            account = resolve_account(private_key)
+            from_address = account.address
+            
+            if len(recipients) != len(amounts):
+                raise ValueError("recipients and amounts must have the same length")
+            for to_address in recipients:
+                if not is_address(to_address):
+                    raise ValueError(f"Invalid recipient address: {to_address}")
+            
+            token_info, gas_price, nonce = await asyncio.gather(
+                self.get_token_balance(token_address, from_address, abi),
+                self.bnb_transfer.estimate_gas_price(),
+                self.web3.eth.get_transaction_count(from_address, 'pending')
+            )
+            
+            amounts_raw = amounts_to_raw(amounts, token_info['decimals'])
+            for amount_raw in amounts_raw:
+                _check_amount_raw(amount_raw)
+            if sum(amounts_raw) > token_info['balance_raw']:
+                raise ValueError(f"Insufficient token balance. Available: {token_info['balance_formatted']} {token_info['token_symbol']}")
+            
+            logger.info("=== Async Bulk Token Transfer: %s transfers of %s from %s ===", len(recipients), token_info['token_symbol'], from_address)
+            
+            checksum_token = token_info['token_address']
+            custom_contract = self.web3.eth.contract(address=checksum_token, abi=abi) if abi else None
+            transactions = []
+            for offset, (to_address, amount_raw) in enumerate(zip(recipients, amounts_raw)):
+                to_checksum = to_checksum_address(to_address)
+                if custom_contract is None:
+                    call_data = encode_transfer(to_checksum, amount_raw)
+                else:
+                    call_data = custom_contract.encodeABI(fn_name="transfer", args=[to_checksum, amount_raw])
+                transactions.append({
+                    'value': 0,
+                    'chainId': self.bnb_transfer.chain_id,
+                    'gas': TOKEN_TRANSFER_GAS_LIMIT,
+                    'gasPrice': gas_price,
+                    'nonce': nonce + offset,
+                    'to': checksum_token,
+                    'data': call_data
+                })
+            
+            # Stage 1: sign off the event loop, reusing one secp256k1 key
+            signer = BatchSigner(account)
+            loop = asyncio.get_running_loop()
+            signed_txs = await asyncio.gather(
+                *[loop.run_in_executor(None, signer.sign, transaction) for transaction in transactions]
+            )
+            
+            # Stage 2: broadcast concurrently, capped to respect RPC rate limits
+            semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+            
+            async def broadcast(signed_tx):
+                async with semaphore:
+                    try:
+                        return await send_raw_transaction_async(self.web3, signed_tx)
+                    except Exception as e:
+                        raise broadcast_error(e)
+            
+            tx_hashes = await asyncio.gather(*[broadcast(signed_tx) for signed_tx in signed_txs], return_exceptions=True)
+            
+            # Transfers above the lowest failed nonce can never be mined past the gap
+            failed_offset = next(
+                (offset for offset, tx_hash in enumerate(tx_hashes) if isinstance(tx_hash, Exception)), None
+            )
+            
+            results = []
+            for offset, (to_address, amount, tx_hash) in enumerate(zip(recipients, amounts, tx_hashes)):
+                result = {
+                    "from_address": from_address,
+                    "to_address": to_address,
+                    "token_address": checksum_token,
+                    "token_name": token_info['token_name'],
+                    "token_symbol": token_info['token_symbol'],
+                    "amount": float(amount)
+                }
+                if isinstance(tx_hash, Exception):
+                    logger.warning("Error broadcasting transfer to %s: %s", to_address, tx_hash)
+                    result["error"] = str(tx_hash)
+                elif failed_offset is not None and offset > failed_offset:
+                    result["error"] = f"Queued behind failed nonce {nonce + failed_offset}"
+                else:
+                    result["tx_hash"] = tx_hash
+                    result["explorer_url"] = f"{BSC_TESTNET_EXPLORER}/tx/{tx_hash}"
+                results.append(result)
+            
+            # Stage 3: await every receipt together
+            if wait_for_confirmation:
+                broadcast_results = [result for result in results if "tx_hash" in result]
+                confirmations = await asyncio.gather(
+                    *[self.bnb_transfer.wait_for_confirmation(result["tx_hash"]) for result in broadcast_results],
+                    return_exceptions=True
+                )
+                for result, confirmation in zip(broadcast_results, confirmations):
+                    if isinstance(confirmation, Exception):
+                        result["error"] = str(confirmation)
+                    else:
+                        result.update(confirmation)
+            
+            sent = len(results) - sum("error" in result for result in results)
+            logger.info("=== Async Bulk Token Transfer Completed: %s of %s succeeded ===", sent, len(results))
+            return results
+        
+        except Exception as e:
+            logger.error("Error in async bulk token transfer: %s", e)
+            raise
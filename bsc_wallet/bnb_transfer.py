@@ -4,54 +4,199 @@ Handles native BNB transfers on BSC Testnet
 """
 
 import logging
+import statistics
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple, Union
+import requests
 from web3 import Web3
-from web3.middleware import geth_poa_middleware
-from eth_account import Account
+from web3.exceptions import TimeExhausted
+from eth_account.signers.local import LocalAccount
 from .config import (
     BSC_TESTNET_RPC_URL, 
     BSC_TESTNET_CHAIN_ID, 
     DEFAULT_GAS_LIMIT, 
     DEFAULT_GAS_PRICE,
+    GAS_PRICE_CACHE_TTL,
+    BALANCE_CACHE_TTL,
+    USE_EIP1559,
+    FEE_HISTORY_BLOCKS,
+    FEE_HISTORY_PERCENTILES,
+    FEE_HISTORY_CACHE_TTL,
     BSC_TESTNET_EXPLORER,
-    BSC_TESTNET_FAUCETS
+    BSC_TESTNET_FAUCETS,
+    CONFIRMATION_TIMEOUT,
+    HTTP_POOL_SIZE
 )
+from .rpc import NonceManager, create_web3, create_session, endpoint_of, send_raw_transaction, wait_for_receipt
+from .utils import is_address, to_checksum_address, resolve_account
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def base_and_priority_fee(fee_history: Dict) -> Tuple[int, int]:
+    """
+    Read the next block's base fee and a typical priority fee from eth_feeHistory
+    
+    Args:
+        fee_history: eth_feeHistory result for FEE_HISTORY_PERCENTILES
+        
+    Returns:
+        (base fee, priority fee) in wei; the priority fee is the median of
+        the per-block 50th percentile rewards and is 0 for empty blocks
+    """
+    # The last entry is the base fee of the next block
+    base_fee = fee_history['baseFeePerGas'][-1]
+    median_index = FEE_HISTORY_PERCENTILES.index(50)
+    priority_fee = int(statistics.median(reward[median_index] for reward in fee_history['reward']))
+    return base_fee, priority_fee
+
+
+def insufficient_balance_error(balance_bnb: float, amount_bnb: float, from_address: str) -> ValueError:
+    """
+    Build the error raised when a wallet cannot cover a BNB transfer
+    
+    Args:
+        balance_bnb: Available balance in BNB
+        amount_bnb: Requested amount in BNB
+        from_address: Sender address
+        
+    Returns:
+        ValueError with faucet hints for empty wallets
+    """
+    error_msg = f"Insufficient balance. Available: {balance_bnb} BNB, Required: {amount_bnb} BNB"
+    if balance_bnb == 0:
+        error_msg += f"\n\n🚨 Your wallet has no testnet BNB!"
+        error_msg += f"\n\n💡 To get testnet BNB, visit one of these faucets:"
+        for faucet in BSC_TESTNET_FAUCETS:
+            error_msg += f"\n   • {faucet}"
+        error_msg += f"\n\n📍 Your wallet address: {from_address}"
+        error_msg += f"\n\n⏰ Faucets typically give 0.1-1 BNB per request and may have daily limits."
+    return ValueError(error_msg)
+
+
+# User-facing broadcast errors keyed by the node's error message prefix
+# (geth-based nodes such as BSC report all of these with code -32000)
+_INSUFFICIENT_FUNDS_MSG = "Insufficient funds: Your wallet doesn't have enough BNB to cover the transaction amount plus gas fees."
+_NONCE_TOO_LOW_MSG = "Nonce too low: This transaction has already been processed or there's a nonce conflict."
+_NONCE_TOO_HIGH_MSG = "Nonce too high: Transaction nonce is higher than expected. Try again in a few seconds."
+_GAS_PRICE_TOO_LOW_MSG = "Gas price too low: Current network gas price is higher than specified. Try increasing the gas price."
+_INTRINSIC_GAS_TOO_LOW_MSG = "Gas limit too low: The transaction requires more gas than specified."
+_CONNECTION_ERROR_MSG = "Network connection issue: Unable to broadcast transaction. Check your internet connection or try a different RPC endpoint."
+
+BROADCAST_ERROR_MESSAGES = {
+    "insufficient funds for gas * price + value": _INSUFFICIENT_FUNDS_MSG,
+    "insufficient funds": _INSUFFICIENT_FUNDS_MSG,
+    "nonce too low": _NONCE_TOO_LOW_MSG,
+    "nonce too high": _NONCE_TOO_HIGH_MSG,
+    "transaction underpriced": _GAS_PRICE_TOO_LOW_MSG,
+    "gas price too low": _GAS_PRICE_TOO_LOW_MSG,
+    "intrinsic gas too low": _INTRINSIC_GAS_TOO_LOW_MSG
+}
+
+
+def _classify_broadcast_error(e: Exception) -> Optional[Exception]:
+    """
+    Look up the user-facing error for a structured JSON-RPC error
+    
+    Args:
+        e: Exception raised while broadcasting
+        
+    Returns:
+        Matching exception, or None when the error is not recognised
+    """
+    if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return ConnectionError(_CONNECTION_ERROR_MSG)
+    
+    # web3 raises ValueError(error_dict) for JSON-RPC error responses
+    error = e.args[0] if e.args else None
+    if not isinstance(error, dict) or not isinstance(error.get("message"), str):
+        return None
+    
+    # Node messages look like "nonce too low: next nonce 5, tx nonce 3"
+    message = BROADCAST_ERROR_MESSAGES.get(error["message"].split(":", 1)[0])
+    return ValueError(message) if message else None
+
+
+def broadcast_error(e: Exception) -> Exception:
+    """
+    Translate a send_raw_transaction failure into a user-facing error
+    
+    Args:
+        e: Exception raised while broadcasting
+        
+    Returns:
+        ValueError or ConnectionError with a specific message
+    """
+    classified = _classify_broadcast_error(e)
+    if classified is not None:
+        return classified
+    
+    # Fall back to scanning the text for providers with non-standard errors
+    error_str = str(e).lower()
+    
+    # Provide more specific error messages
+    if "insufficient funds" in error_str:
+        return ValueError(_INSUFFICIENT_FUNDS_MSG)
+    elif "nonce too low" in error_str:
+        return ValueError(_NONCE_TOO_LOW_MSG)
+    elif "nonce too high" in error_str:
+        return ValueError(_NONCE_TOO_HIGH_MSG)
+    elif "gas price too low" in error_str:
+        return ValueError(_GAS_PRICE_TOO_LOW_MSG)
+    elif "intrinsic gas too low" in error_str:
+        return ValueError(_INTRINSIC_GAS_TOO_LOW_MSG)
+    elif "connection" in error_str or "timeout" in error_str:
+        return ConnectionError(_CONNECTION_ERROR_MSG)
+    else:
+        logger.error("Error broadcasting transaction: %s", e)
+        return ValueError(f"Transaction broadcast failed: {e}")
+
+
 class BNBTransfer:
     """
     Handles BNB transfers on BSC Testnet
     """
     
-    def __init__(self, rpc_url: str = BSC_TESTNET_RPC_URL):
+    def __init__(self, rpc_url: str = BSC_TESTNET_RPC_URL, web3: Optional[Web3] = None,
+                 pool_size: int = HTTP_POOL_SIZE, use_eip1559: bool = USE_EIP1559,
+                 nonce_manager: Optional[NonceManager] = None):
         """
         Initialize BNB transfer handler
         
         Args:
-            rpc_url: BSC Testnet RPC URL
+            rpc_url: BSC Testnet RPC URL (http(s):// or ws(s)://)
+            web3: Shared Web3 instance (optional, rpc_url is ignored when given)
+            pool_size: HTTP connection pool size when creating our own Web3
+            use_eip1559: Build dynamic-fee (type 2) transactions instead of legacy gasPrice ones
+            nonce_manager: Nonce allocator shared with other handlers (optional)
         """
         try:
-            self.web3 = Web3(Web3.HTTPProvider(rpc_url))
-            
-            # Add POA middleware for BSC (Proof of Authority chain)
-            self.web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+            if web3 is None:
+                web3 = create_web3(rpc_url, session=create_session(pool_size))
+            self.web3 = web3
             
             self.chain_id = BSC_TESTNET_CHAIN_ID
             
-            if not self.web3.is_connected():
+            self.use_eip1559 = use_eip1559
+            
+            # (fetched_at, value) from the last eth_gasPrice / eth_feeHistory call
+            self._gas_price_cache = (0.0, 0)
+            self._fee_cache = (0.0, None)
+            
+            # Sender balance for pre-flight checks: address -> (fetched_at, balance_wei)
+            self._balance_cache = {}
+            
+            self.nonce_manager = nonce_manager if nonce_manager is not None else NonceManager(self.web3)
+            
+            self.connected = self.web3.is_connected()
+            if not self.connected:
                 raise ConnectionError("Failed to connect to BSC Testnet")
             
-            logger.info(f"Connected to BSC Testnet: {rpc_url}")
-            logger.info(f"Chain ID: {self.chain_id}")
-            logger.info("POA middleware injected for BSC compatibility")
+            logger.info("Connected to BSC Testnet: %s", endpoint_of(self.web3))
+            logger.info("Chain ID: %s", self.chain_id)
             
         except Exception as e:
-            logger.error(f"Error initializing BNB transfer: {e}")
+            logger.error("Error initializing BNB transfer: %s", e)
             raise
     
     def get_balance(self, address: str) -> Dict[str, float]:
@@ -66,11 +211,11 @@ class BNBTransfer:
         """
         try:
             # Validate address
-            if not self.web3.is_address(address):
+            if not is_address(address):
                 raise ValueError("Invalid address format")
             
             # Convert to checksum address
-            checksum_address = self.web3.to_checksum_address(address)
+            checksum_address = to_checksum_address(address)
             
             # Get balance in wei
             balance_wei = self.web3.eth.get_balance(checksum_address)
@@ -84,62 +229,170 @@ class BNBTransfer:
                 "balance_bnb": float(balance_bnb)
             }
             
-            logger.info(f"Balance for {checksum_address}: {balance_bnb} BNB")
+            logger.info("Balance for %s: %s BNB", checksum_address, balance_bnb)
             return result
             
         except Exception as e:
-            logger.error(f"Error getting balance: {e}")
+            logger.error("Error getting balance: %s", e)
             raise
     
+    def _spendable_balance(self, address: str) -> int:
+        """
+        Get a sender's balance for the send_bnb pre-flight check
+        
+        The balance is fetched at most once per BALANCE_CACHE_TTL and debited
+        locally by each transfer sent in the meantime. The check is only a
+        convenience; the node still rejects transfers it cannot fund.
+        
+        Args:
+            address: Checksummed sender address
+            
+        Returns:
+            Balance in wei
+        """
+        cached = self._balance_cache.get(address)
+        if cached is not None and time.monotonic() - cached[0] < BALANCE_CACHE_TTL:
+            return cached[1]
+        
+        balance_wei = self.get_balance(address)["balance_wei"]
+        self._balance_cache[address] = (time.monotonic(), balance_wei)
+        return balance_wei
+    
+    def _debit_balance(self, address: str, transaction: Dict) -> None:
+        """
+        Subtract a broadcast transaction's maximum cost from the cached balance
+        
+        Args:
+            address: Checksummed sender address
+            transaction: Transaction that was broadcast
+        """
+        cached = self._balance_cache.get(address)
+        if cached is not None:
+            fee_per_gas = transaction.get('maxFeePerGas', transaction.get('gasPrice', 0))
+            cost = transaction['value'] + transaction['gas'] * fee_per_gas
+            self._balance_cache[address] = (cached[0], cached[1] - cost)
+    
     def estimate_gas_price(self) -> int:
         """
         Get current gas price from the network
         
+        The price is cached for GAS_PRICE_CACHE_TTL seconds since it only
+        changes from block to block.
+        
         Returns:
             Gas price in wei
         """
+        cached_price = self.cached_gas_price()
+        if cached_price is not None:
+            return cached_price
+        
         try:
             gas_price = self.web3.eth.gas_price
-            logger.info(f"Current gas price: {gas_price} wei ({self.web3.from_wei(gas_price, 'gwei')} gwei)")
+            self.cache_gas_price(gas_price)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Current gas price: %s wei (%s gwei)", gas_price, self.web3.from_wei(gas_price, 'gwei'))
             return gas_price
         except Exception as e:
-            logger.warning(f"Error getting gas price, using default: {e}")
+            logger.warning("Error getting gas price, using default: %s", e)
             return DEFAULT_GAS_PRICE
     
+    def cached_gas_price(self) -> Optional[int]:
+        """
+        Get the gas price estimate_gas_price would reuse without an RPC
+        
+        Returns:
+            Gas price in wei, or None if nothing was fetched in the last
+            GAS_PRICE_CACHE_TTL seconds
+        """
+        fetched_at, cached_price = self._gas_price_cache
+        if cached_price and time.monotonic() - fetched_at < GAS_PRICE_CACHE_TTL:
+            return cached_price
+        return None
+    
+    def cache_gas_price(self, gas_price: int) -> None:
+        """
+        Record a gas price fetched elsewhere (e.g. in a JSON-RPC batch)
+        
+        Args:
+            gas_price: Gas price in wei
+        """
+        self._gas_price_cache = (time.monotonic(), gas_price)
+    
+    def estimate_fees(self) -> Dict[str, int]:
+        """
+        Estimate EIP-1559 fees from recent fee history
+        
+        The priority fee is the median of the per-block 50th percentile
+        rewards, and maxFeePerGas leaves room for the base fee to double.
+        Results are cached for FEE_HISTORY_CACHE_TTL seconds.
+        
+        Returns:
+            Dict with maxFeePerGas and maxPriorityFeePerGas in wei
+        """
+        fetched_at, cached_fees = self._fee_cache
+        if cached_fees and time.monotonic() - fetched_at < FEE_HISTORY_CACHE_TTL:
+            return cached_fees
+        
+        fee_history = self.web3.eth.fee_history(FEE_HISTORY_BLOCKS, 'latest', FEE_HISTORY_PERCENTILES)
+        base_fee, priority_fee = base_and_priority_fee(fee_history)
+        
+        # Empty blocks report zero rewards; fall back to the network gas price
+        if priority_fee == 0:
+            priority_fee = max(self.estimate_gas_price() - base_fee, 0)
+        
+        fees = {
+            'maxFeePerGas': 2 * base_fee + priority_fee,
+            'maxPriorityFeePerGas': priority_fee
+        }
+        self._fee_cache = (time.monotonic(), fees)
+        
+        logger.info("Estimated fees: base %s wei, priority %s wei", base_fee, priority_fee)
+        return fees
+    
     def create_transaction(self, from_address: str, to_address: str, 
                          amount_bnb: float, gas_price: Optional[int] = None) -> Dict:
         """
         Create a BNB transfer transaction
         
+        Builds a dynamic-fee (type 2) transaction when use_eip1559 is set and
+        no gas_price is given, and a legacy gasPrice transaction otherwise or
+        when the node cannot report fee history.
+        
         Args:
             from_address: Sender address
             to_address: Recipient address
             amount_bnb: Amount in BNB to send
-            gas_price: Gas price in wei (optional)
+            gas_price: Gas price in wei (optional, forces a legacy transaction)
             
         Returns:
             Transaction dictionary
         """
         try:
             # Validate addresses
-            if not self.web3.is_address(from_address):
+            if not is_address(from_address):
                 raise ValueError("Invalid from_address format")
-            if not self.web3.is_address(to_address):
+            if not is_address(to_address):
                 raise ValueError("Invalid to_address format")
             
             # Convert to checksum addresses
-            from_checksum = self.web3.to_checksum_address(from_address)
-            to_checksum = self.web3.to_checksum_address(to_address)
+            from_checksum = to_checksum_address(from_address)
+            to_checksum = to_checksum_address(to_address)
             
             # Convert amount to wei
             amount_wei = self.web3.to_wei(amount_bnb, 'ether')
             
-            # Get gas price
-            if gas_price is None:
+            # Get fees
+            fees = None
+            if gas_price is None and self.use_eip1559:
+                try:
+                    fees = self.estimate_fees()
+                except Exception as e:
+                    logger.warning("Fee history unavailable, using legacy gas price: %s", e)
+            if fees is None and gas_price is None:
                 gas_price = self.estimate_gas_price()
             
             # Get nonce
-            nonce = self.web3.eth.get_transaction_count(from_checksum)
+            nonce = self.nonce_manager.next(from_checksum)
             
             # Create transaction
             transaction = {
@@ -147,87 +400,73 @@ class BNBTransfer:
                 'to': to_checksum,
                 'value': amount_wei,
                 'gas': DEFAULT_GAS_LIMIT,
-                'gasPrice': gas_price,
                 'chainId': self.chain_id
             }
+            if fees is not None:
+                transaction['type'] = 2
+                transaction.update(fees)
+            else:
+                transaction['gasPrice'] = gas_price
             
-            logger.info(f"Created transaction: {amount_bnb} BNB from {from_checksum} to {to_checksum}")
+            logger.info("Created transaction: %s BNB from %s to %s", amount_bnb, from_checksum, to_checksum)
             return transaction
             
         except Exception as e:
-            logger.error(f"Error creating transaction: {e}")
+            logger.error("Error creating transaction: %s", e)
             raise
     
-    def sign_transaction(self, transaction: Dict, private_key: str) -> str:
+    def sign_transaction(self, transaction: Dict, private_key: Union[str, LocalAccount]) -> bytes:
         """
         Sign a transaction with private key
         
         Args:
             transaction: Transaction dictionary
-            private_key: Private key (hex string)
+            private_key: Private key (hex string) or LocalAccount
             
         Returns:
-            Signed transaction (hex string)
+            Signed raw transaction bytes, ready for broadcast_transaction
         """
         try:
-            # Remove '0x' prefix if present
-            if private_key.startswith('0x'):
-                private_key = private_key[2:]
-            
-            # Sign transaction
-            signed_txn = self.web3.eth.account.sign_transaction(transaction, private_key)
+            # Sign with the cached account so the key is not parsed again
+            signed_txn = resolve_account(private_key).sign_transaction(transaction)
             
             logger.info("Transaction signed successfully")
-            return signed_txn.rawTransaction.hex()
+            return signed_txn.rawTransaction
             
         except Exception as e:
-            logger.error(f"Error signing transaction: {e}")
+            logger.error("Error signing transaction: %s", e)
             raise
     
-    def broadcast_transaction(self, signed_transaction: str) -> str:
+    def broadcast_transaction(self, signed_transaction: Union[bytes, str]) -> str:
         """
         Broadcast signed transaction to the network
         
         Args:
-            signed_transaction: Signed transaction (hex string)
+            signed_transaction: Signed raw transaction (bytes, or a hex string)
             
         Returns:
-            Transaction hash
+            Transaction hash (hex string)
         """
         try:
             # Send transaction
-            tx_hash = self.web3.eth.send_raw_transaction(signed_transaction)
-            tx_hash_hex = tx_hash.hex()
+            tx_hash_hex = send_raw_transaction(self.web3, signed_transaction)
             
-            logger.info(f"Transaction broadcasted with hash: {tx_hash_hex}")
-            logger.info(f"View on BSC Testnet Explorer: {BSC_TESTNET_EXPLORER}/tx/{tx_hash_hex}")
+            logger.info("Transaction broadcasted with hash: %s", tx_hash_hex)
+            logger.info("View on BSC Testnet Explorer: %s/tx/%s", BSC_TESTNET_EXPLORER, tx_hash_hex)
             
             return tx_hash_hex
             
         except Exception as e:
-            error_str = str(e).lower()
-            
-            # Provide more specific error messages
-            if "insufficient funds" in error_str:
-                raise ValueError("Insufficient funds: Your wallet doesn't have enough BNB to cover the transaction amount plus gas fees.")
-            elif "nonce too low" in error_str:
-                raise ValueError("Nonce too low: This transaction has already been processed or there's a nonce conflict.")
-            elif "nonce too high" in error_str:
-                raise ValueError("Nonce too high: Transaction nonce is higher than expected. Try again in a few seconds.")
-            elif "gas price too low" in error_str:
-                raise ValueError("Gas price too low: Current network gas price is higher than specified. Try increasing the gas price.")
-            elif "intrinsic gas too low" in error_str:
-                raise ValueError("Gas limit too low: The transaction requires more gas than specified.")
-            elif "connection" in error_str or "timeout" in error_str:
-                raise ConnectionError("Network connection issue: Unable to broadcast transaction. Check your internet connection or try a different RPC endpoint.")
-            else:
-                logger.error(f"Error broadcasting transaction: {e}")
-                raise ValueError(f"Transaction broadcast failed: {e}")
+            raise broadcast_error(e)
     
-    def wait_for_confirmation(self, tx_hash: str, timeout: int = 300) -> Dict:
+    def wait_for_confirmation(self, tx_hash: str, timeout: int = CONFIRMATION_TIMEOUT) -> Dict:
         """
         Wait for transaction confirmation
         
+        Checks back off up to about one block interval. Over WebSocket they
+        go to a new-block filter and the receipt is only re-fetched once a
+        block arrives; over HTTP the receipt itself is polled.
+        
         Args:
             tx_hash: Transaction hash
             timeout: Timeout in seconds
@@ -236,82 +475,88 @@ class BNBTransfer:
             Transaction receipt
         """
         try:
-            logger.info(f"Waiting for confirmation of transaction: {tx_hash}")
+            logger.info("Waiting for confirmation of transaction: %s", tx_hash)
             
             start_time = time.time()
-            while time.time() - start_time < timeout:
-                try:
-                    receipt = self.web3.eth.get_transaction_receipt(tx_hash)
-                    if receipt:
-                        status = "Success" if receipt.status == 1 else "Failed"
-                        logger.info(f"Transaction confirmed! Status: {status}")
-                        logger.info(f"Gas used: {receipt.gasUsed}")
-                        logger.info(f"Block number: {receipt.blockNumber}")
-                        
-                        return {
-                            "tx_hash": tx_hash,
-                            "status": status,
-                            "gas_used": receipt.gasUsed,
-                            "block_number": receipt.blockNumber,
-                            "confirmation_time": time.time() - start_time
-                        }
-                except Exception:
-                    # Transaction not yet mined
-                    pass
-                
-                time.sleep(2)  # Wait 2 seconds before checking again
+            try:
+                receipt = wait_for_receipt(self.web3, tx_hash, timeout)
+            except TimeExhausted:
+                raise TimeoutError(f"Transaction confirmation timeout after {timeout} seconds")
+            
+            status = "Success" if receipt.status == 1 else "Failed"
+            logger.info("Transaction confirmed! Status: %s", status)
+            logger.info("Gas used: %s", receipt.gasUsed)
+            logger.info("Block number: %s", receipt.blockNumber)
             
-            raise TimeoutError(f"Transaction confirmation timeout after {timeout} seconds")
+            return {
+                "tx_hash": tx_hash,
+                "status": status,
+                "gas_used": receipt.gasUsed,
+                "block_number": receipt.blockNumber,
+                "confirmation_time": time.time() - start_time
+            }
             
         except Exception as e:
-            logger.error(f"Error waiting for confirmation: {e}")
+            logger.error("Error waiting for confirmation: %s", e)
             raise
     
-    def send_bnb(self, private_key: str, to_address: str, amount_bnb: float, 
-                 wait_for_confirmation: bool = True) -> Dict:
+    def send_bnb(self, private_key: Union[str, LocalAccount], to_address: str, amount_bnb: float, 
+                 wait_for_confirmation: bool = False, check_balance: bool = True) -> Dict:
         """
         Complete BNB transfer process
         
+        Returns as soon as the transaction is broadcast unless
+        wait_for_confirmation is set.
+        
         Args:
-            private_key: Sender's private key
+            private_key: Sender's private key (hex string) or LocalAccount
             to_address: Recipient address
             amount_bnb: Amount in BNB to send
             wait_for_confirmation: Whether to wait for confirmation
+            check_balance: Check the sender balance before sending (the node
+                rejects underfunded transfers either way)
             
         Returns:
             Transaction result with hash, gas used, and status
         """
         try:
             # Get sender address
-            account = Account.from_key(private_key)
+            account = resolve_account(private_key)
             from_address = account.address
             
-            logger.info(f"=== BNB Transfer Process Started ===")
-            logger.info(f"From: {from_address}")
-            logger.info(f"To: {to_address}")
-            logger.info(f"Amount: {amount_bnb} BNB")
+            logger.info("=== BNB Transfer Process Started ===")
+            logger.info("From: %s", from_address)
+            logger.info("To: %s", to_address)
+            logger.info("Amount: %s BNB", amount_bnb)
             
             # Check sender balance
-            balance_info = self.get_balance(from_address)
-            if balance_info['balance_bnb'] < amount_bnb:
-                error_msg = f"Insufficient balance. Available: {balance_info['balance_bnb']} BNB, Required: {amount_bnb} BNB"
-                if balance_info['balance_bnb'] == 0:
-                    error_msg += f"\n\n🚨 Your wallet has no testnet BNB!"
-                    error_msg += f"\n\n💡 To get testnet BNB, visit one of these faucets:"
-                    for faucet in BSC_TESTNET_FAUCETS:
-                        error_msg += f"\n   • {faucet}"
-                    error_msg += f"\n\n📍 Your wallet address: {from_address}"
-                    error_msg += f"\n\n⏰ Faucets typically give 0.1-1 BNB per request and may have daily limits."
-                raise ValueError(error_msg)
-            
-            # Create transaction
-            transaction = self.create_transaction(from_address, to_address, amount_bnb)
-            
-            # Sign transaction
-            signed_tx = self.sign_transaction(transaction, private_key)
-            
-            # Broadcast transaction
-            tx_hash = self.broadcast_transaction(signed_tx)
+            if check_balance:
+                balance_bnb = float(self.web3.from_wei(self._spendable_balance(from_address), 'ether'))
+                if balance_bnb < amount_bnb:
+                    raise insufficient_balance_error(balance_bnb, amount_bnb, from_address)
+            
+            for attempt in range(2):
+                # Create transaction
+                transaction = self.create_transaction(from_address, to_address, amount_bnb)
+                
+                try:
+                    # Sign transaction
+                    signed_tx = self.sign_transaction(transaction, account)
+                    
+                    # Broadcast transaction
+                    tx_hash = self.broadcast_transaction(signed_tx)
+                    break
+                except Exception as e:
+                    # The allocated nonce was never used; resync from the node next time
+                    self.nonce_manager.reset(from_address)
+                    
+                    # Another sender used the cached nonce; retry once with the node's pending count
+                    if attempt == 0 and "nonce too low" in str(e).lower():
+                        logger.warning("Cached nonce %s was already used, retrying with a fresh nonce", transaction['nonce'])
+                        continue
+                    raise
+            
+            self._debit_balance(from_address, transaction)
             
             result = {
                 "tx_hash": tx_hash,
@@ -326,11 +571,11 @@ class BNBTransfer:
                 confirmation = self.wait_for_confirmation(tx_hash)
                 result.update(confirmation)
             
-            logger.info(f"=== BNB Transfer Completed ===")
+            logger.info("=== BNB Transfer Completed ===")
             return result
             
         except Exception as e:
-            logger.error(f"Error in BNB transfer: {e}")
+            logger.error("Error in BNB transfer: %s", e)
             raise
 
 
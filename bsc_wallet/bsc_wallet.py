@@ -4,14 +4,24 @@ Combines wallet generation, BNB transfers, and token transfers
 """
 
 import logging
-from typing import Dict, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, List, Sequence, Union
+from eth_account.signers.local import LocalAccount
 from .wallet_generator import WalletGenerator
 from .bnb_transfer import BNBTransfer
 from .token_transfer import TokenTransfer
-from .config import BSC_TESTNET_EXPLORER, SAMPLE_TOKENS
+from .config import (
+    BSC_TESTNET_RPC_URL,
+    BSC_TESTNET_EXPLORER,
+    SAMPLE_TOKENS,
+    MULTICALL3_ADDRESS,
+    MULTICALL3_ABI,
+    ERC20_SELECTORS,
+    BULK_MAX_WORKERS
+)
+from .rpc import NonceManager, create_web3, create_session, batch_request, rpc_result
+from .utils import is_address, to_checksum_address
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -30,17 +40,24 @@ class BSCWallet:
         try:
             self.wallet_generator = WalletGenerator()
             
-            if rpc_url:
-                self.bnb_transfer = BNBTransfer(rpc_url)
-                self.token_transfer = TokenTransfer(rpc_url)
-            else:
-                self.bnb_transfer = BNBTransfer()
-                self.token_transfer = TokenTransfer()
+            # One Web3 (and one pooled keep-alive HTTP session) shared by all handlers
+            self.web3 = create_web3(rpc_url or BSC_TESTNET_RPC_URL, session=create_session())
             
-            logger.info("BSC Wallet initialized successfully")
+            # BNB and token sends from one account draw from the same nonce counter
+            self.nonce_manager = NonceManager(self.web3)
+            self.bnb_transfer = BNBTransfer(web3=self.web3, nonce_manager=self.nonce_manager)
+            self.token_transfer = TokenTransfer(web3=self.web3, nonce_manager=self.nonce_manager)
+            
+            # Multicall3 contract, built on first use
+            self._multicall = None
             
+            # Chain ID reported by the node, fetched with the first get_network_info()
+            self._chain_id = None
+            
+            logger.info("BSC Wallet initialized successfully")
+        
         except Exception as e:
-            logger.error(f"Error initializing BSC Wallet: {e}")
+            logger.error("Error initializing BSC Wallet: %s", e)
             raise
     
     # Wallet Generation Methods
@@ -57,7 +74,7 @@ class BSCWallet:
         try:
             return self.wallet_generator.create_new_wallet(strength)
         except Exception as e:
-            logger.error(f"Error creating new wallet: {e}")
+            logger.error("Error creating new wallet: %s", e)
             raise
     
     def import_wallet_from_mnemonic(self, mnemonic: str, account_index: int = 0) -> Dict[str, str]:
@@ -67,14 +84,14 @@ class BSCWallet:
         Args:
             mnemonic: BIP39 mnemonic phrase
             account_index: Account index for BIP44 derivation
-            
+        
         Returns:
             Dict containing wallet information
         """
         try:
             return self.wallet_generator.derive_wallet_from_mnemonic(mnemonic, account_index)
         except Exception as e:
-            logger.error(f"Error importing wallet from mnemonic: {e}")
+            logger.error("Error importing wallet from mnemonic: %s", e)
             raise
     
     def import_wallet_from_private_key(self, private_key: str) -> Dict[str, str]:
@@ -83,14 +100,14 @@ class BSCWallet:
         
         Args:
             private_key: Hexadecimal private key
-            
+        
         Returns:
             Dict containing wallet information
         """
         try:
             return self.wallet_generator.import_wallet_from_private_key(private_key)
         except Exception as e:
-            logger.error(f"Error importing wallet from private key: {e}")
+            logger.error("Error importing wallet from private key: %s", e)
             raise
     
     # Balance Methods
@@ -100,14 +117,14 @@ class BSCWallet:
         
         Args:
             address: Wallet address
-            
+        
         Returns:
             Dict with balance information
         """
         try:
             return self.bnb_transfer.get_balance(address)
         except Exception as e:
-            logger.error(f"Error getting BNB balance: {e}")
+            logger.error("Error getting BNB balance: %s", e)
             raise
     
     def get_token_balance(self, token_address: str, wallet_address: str, abi: list = None) -> Dict:
@@ -118,100 +135,260 @@ class BSCWallet:
             token_address: Token contract address
             wallet_address: Wallet address
             abi: Token ABI (optional)
-            
+        
         Returns:
             Dict with balance information
         """
         try:
             return self.token_transfer.get_token_balance(token_address, wallet_address, abi)
         except Exception as e:
-            logger.error(f"Error getting token balance: {e}")
+            logger.error("Error getting token balance: %s", e)
             raise
     
+    # Token view calls fetched per token by get_all_balances, in result order
+    _BALANCE_FIELDS = ("name", "symbol", "decimals", "balanceOf")
+    
+    def _token_balance_calls(self, checksum_wallet: str, tokens: Dict[str, str]) -> List[tuple]:
+        """
+        Build the (target, calldata) pairs for name/symbol/decimals/balanceOf of each token
+        
+        Args:
+            checksum_wallet: Checksummed wallet address
+            tokens: Mapping of result key to token contract address
+        
+        Returns:
+            List of (token address, calldata hex) pairs
+        """
+        # balanceOf(address) takes the wallet left-padded to 32 bytes
+        balance_of_args = bytes(12) + bytes.fromhex(checksum_wallet[2:])
+        
+        calls = []
+        for token_address in tokens.values():
+            checksum_token = to_checksum_address(token_address)
+            for fn_name in self._BALANCE_FIELDS:
+                call_data = ERC20_SELECTORS[fn_name] + (balance_of_args if fn_name == "balanceOf" else b"")
+                calls.append((checksum_token, "0x" + call_data.hex()))
+        return calls
+    
+    def _assemble_balances(self, wallet_address: str, checksum_wallet: str, balance_wei: int,
+                           tokens: Dict[str, str], token_returns: List[Optional[bytes]]) -> Dict:
+        """
+        Build the get_all_balances result from raw call return data
+        
+        Args:
+            wallet_address: Wallet address as passed by the caller
+            checksum_wallet: Checksummed wallet address
+            balance_wei: BNB balance in wei
+            tokens: Mapping of result key to token contract address
+            token_returns: Return data for _token_balance_calls, None for failed calls
+        
+        Returns:
+            Dict with all balance information
+        """
+        web3 = self.bnb_transfer.web3
+        result = {
+            "wallet_address": wallet_address,
+            "bnb_balance": {
+                "address": checksum_wallet,
+                "balance_wei": balance_wei,
+                "balance_bnb": float(web3.from_wei(balance_wei, 'ether'))
+            },
+            "token_balances": {}
+        }
+        
+        def decode(data, output_type, default):
+            try:
+                return web3.codec.decode([output_type], data)[0]
+            except Exception:
+                return default
+        
+        field_count = len(self._BALANCE_FIELDS)
+        for position, (token_key, token_address) in enumerate(tokens.items()):
+            name_data, symbol_data, decimals_data, balance_data = \
+                token_returns[field_count * position:field_count * (position + 1)]
+            try:
+                balance_raw = web3.codec.decode(["uint256"], balance_data)[0]
+            except Exception as e:
+                logger.warning("Error getting balance for %s: %s", token_key, e)
+                continue
+            
+            decimals = decode(decimals_data, "uint8", 18)
+            result["token_balances"][token_key] = {
+                "wallet_address": checksum_wallet,
+                "token_address": to_checksum_address(token_address),
+                "token_name": decode(name_data, "string", "Unknown"),
+                "token_symbol": decode(symbol_data, "string", "UNK"),
+                "balance_raw": balance_raw,
+                "balance_formatted": balance_raw / (10 ** decimals),
+                "decimals": decimals
+            }
+        
+        return result
+    
+    def _get_all_balances_multicall(self, wallet_address: str, tokens: Dict[str, str]) -> Dict:
+        """
+        Get BNB and token balances with a single Multicall3 aggregate3 eth_call
+        
+        Args:
+            wallet_address: Wallet address
+            tokens: Mapping of result key to token contract address
+        
+        Returns:
+            Dict with all balance information
+        """
+        web3 = self.bnb_transfer.web3
+        checksum_wallet = to_checksum_address(wallet_address)
+        if self._multicall is None:
+            self._multicall = web3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        multicall = self._multicall
+        
+        calls = [(MULTICALL3_ADDRESS, multicall.encodeABI(fn_name="getEthBalance", args=[checksum_wallet]))]
+        calls.extend(self._token_balance_calls(checksum_wallet, tokens))
+        
+        results = multicall.functions.aggregate3(
+            [(target, True, call_data) for target, call_data in calls]
+        ).call()
+        
+        balance_success, balance_data = results[0]
+        if not balance_success:
+            raise ValueError("Multicall3 getEthBalance failed")
+        balance_wei = web3.codec.decode(["uint256"], balance_data)[0]
+        
+        token_returns = [data if success else None for success, data in results[1:]]
+        return self._assemble_balances(wallet_address, checksum_wallet, balance_wei, tokens, token_returns)
+    
+    def _get_all_balances_batched(self, wallet_address: str, tokens: Dict[str, str]) -> Dict:
+        """
+        Get BNB and token balances with a single JSON-RPC batch
+        
+        Args:
+            wallet_address: Wallet address
+            tokens: Mapping of result key to token contract address
+        
+        Returns:
+            Dict with all balance information
+        """
+        web3 = self.bnb_transfer.web3
+        checksum_wallet = to_checksum_address(wallet_address)
+        
+        requests = [("eth_getBalance", [checksum_wallet, "latest"])]
+        for target, call_data in self._token_balance_calls(checksum_wallet, tokens):
+            requests.append(("eth_call", [{"to": target, "data": call_data}, "latest"]))
+        
+        responses = batch_request(web3, requests)
+        balance_wei = int(rpc_result(responses[0]), 16)
+        
+        token_returns = []
+        for response in responses[1:]:
+            try:
+                token_returns.append(bytes.fromhex(rpc_result(response)[2:]))
+            except Exception:
+                token_returns.append(None)
+        
+        return self._assemble_balances(wallet_address, checksum_wallet, balance_wei, tokens, token_returns)
+    
     def get_all_balances(self, wallet_address: str, token_addresses: List[str] = None) -> Dict:
         """
         Get all balances (BNB + tokens) for a wallet
         
+        All lookups are aggregated into one Multicall3 eth_call. If that
+        fails they are sent as one JSON-RPC batch, and if the node rejects
+        the batch, balances are fetched with concurrent individual calls.
+        
         Args:
             wallet_address: Wallet address
             token_addresses: List of token contract addresses (optional)
-            
+        
         Returns:
             Dict with all balance information
         """
         try:
+            # Token balances are keyed by address when given, else by sample token name
+            if token_addresses:
+                tokens = {token_address: token_address for token_address in token_addresses}
+            else:
+                tokens = dict(SAMPLE_TOKENS)
+            
+            try:
+                return self._get_all_balances_multicall(wallet_address, tokens)
+            except Exception as e:
+                logger.warning("Multicall3 balance lookup failed, falling back to a JSON-RPC batch: %s", e)
+            
+            try:
+                return self._get_all_balances_batched(wallet_address, tokens)
+            except Exception as e:
+                logger.warning("Batched balance lookup failed, falling back to sequential calls: %s", e)
+            
             result = {
                 "wallet_address": wallet_address,
                 "bnb_balance": None,
                 "token_balances": {}
             }
             
+            # Overlap the individual round-trips on the pooled HTTP session
+            with ThreadPoolExecutor(max_workers=min(BULK_MAX_WORKERS, len(tokens) + 1)) as executor:
+                bnb_future = executor.submit(self.get_bnb_balance, wallet_address)
+                token_futures = [
+                    (token_key, executor.submit(self.get_token_balance, token_address, wallet_address))
+                    for token_key, token_address in tokens.items()
+                ]
+            
             # Get BNB balance
             try:
-                result["bnb_balance"] = self.get_bnb_balance(wallet_address)
+                result["bnb_balance"] = bnb_future.result()
             except Exception as e:
-                logger.warning(f"Error getting BNB balance: {e}")
+                logger.warning("Error getting BNB balance: %s", e)
             
             # Get token balances
-            if token_addresses:
-                for token_address in token_addresses:
-                    try:
-                        token_balance = self.get_token_balance(token_address, wallet_address)
-                        result["token_balances"][token_address] = token_balance
-                    except Exception as e:
-                        logger.warning(f"Error getting balance for token {token_address}: {e}")
-            
-            # Try sample tokens if no specific tokens provided
-            elif SAMPLE_TOKENS:
-                for token_name, token_address in SAMPLE_TOKENS.items():
-                    try:
-                        token_balance = self.get_token_balance(token_address, wallet_address)
-                        result["token_balances"][token_name] = token_balance
-                    except Exception as e:
-                        logger.warning(f"Error getting balance for {token_name}: {e}")
+            for token_key, future in token_futures:
+                try:
+                    result["token_balances"][token_key] = future.result()
+                except Exception as e:
+                    logger.warning("Error getting balance for %s: %s", token_key, e)
             
             return result
-            
+        
         except Exception as e:
-            logger.error(f"Error getting all balances: {e}")
+            logger.error("Error getting all balances: %s", e)
             raise
     
-
-    
     # Transfer Methods
-    def send_bnb(self, private_key: str, to_address: str, amount_bnb: float, 
-                 wait_for_confirmation: bool = True) -> Dict:
+    def send_bnb(self, private_key: Union[str, LocalAccount], to_address: str, amount_bnb: float, 
+                 wait_for_confirmation: bool = False, check_balance: bool = True) -> Dict:
         """
-        Send BNB to another address
+        Send BNB to another address, returning once it is broadcast unless
+        wait_for_confirmation is set
         
         Args:
-            private_key: Sender's private key
+            private_key: Sender's private key (hex string) or LocalAccount
             to_address: Recipient address
             amount_bnb: Amount in BNB to send
             wait_for_confirmation: Whether to wait for confirmation
-            
+            check_balance: Check the sender balance before sending
+        
         Returns:
             Transaction result
         """
         try:
-            return self.bnb_transfer.send_bnb(private_key, to_address, amount_bnb, wait_for_confirmation)
+            return self.bnb_transfer.send_bnb(private_key, to_address, amount_bnb, wait_for_confirmation,
+                                              check_balance)
         except Exception as e:
-            logger.error(f"Error sending BNB: {e}")
+            logger.error("Error sending BNB: %s", e)
             raise
     
-    def send_token(self, private_key: str, token_address: str, to_address: str, 
+    def send_token(self, private_key: Union[str, LocalAccount], token_address: str, to_address: str, 
                    amount: float, abi: list = None, wait_for_confirmation: bool = True) -> Dict:
         """
         Send BEP-20 tokens to another address
         
         Args:
-            private_key: Sender's private key
+            private_key: Sender's private key (hex string) or LocalAccount
             token_address: Token contract address
             to_address: Recipient address
             amount: Amount of tokens to send
             abi: Token ABI (optional)
             wait_for_confirmation: Whether to wait for confirmation
-            
+        
         Returns:
             Transaction result
         """
@@ -220,10 +397,32 @@ class BSCWallet:
                 private_key, token_address, to_address, amount, abi, wait_for_confirmation
             )
         except Exception as e:
-            logger.error(f"Error sending token: {e}")
+            logger.error("Error sending token: %s", e)
             raise
     
     # Utility Methods
+    def send_tokens_bulk(self, private_key: Union[str, LocalAccount], token_address: str,
+                         recipients: List[str], amounts: Sequence[float], abi: list = None) -> List[Dict]:
+        """
+        Send one BEP-20 token to many recipients without waiting for confirmations
+        
+        Args:
+            private_key: Sender's private key (hex string) or LocalAccount
+            token_address: Token contract address
+            recipients: Recipient addresses
+            amounts: Amount of tokens for each recipient
+            abi: Token ABI (optional)
+        
+        Returns:
+            List of transaction results in recipient order; transfers that
+            were not broadcast have an "error" entry instead of a tx_hash
+        """
+        try:
+            return self.token_transfer.send_tokens_bulk(private_key, token_address, recipients, amounts, abi)
+        except Exception as e:
+            logger.error("Error sending tokens in bulk: %s", e)
+            raise
+    
     def get_token_info(self, token_address: str, abi: list = None) -> Dict:
         """
         Get token information
@@ -231,52 +430,127 @@ class BSCWallet:
         Args:
             token_address: Token contract address
             abi: Token ABI (optional)
-            
+        
         Returns:
             Dict with token information
         """
         try:
             return self.token_transfer.get_token_info(token_address, abi)
         except Exception as e:
-            logger.error(f"Error getting token info: {e}")
+            logger.error("Error getting token info: %s", e)
             raise
     
+    def get_token_balances_bulk(self, token_address: str, wallet_addresses: List[str], abi: list = None) -> Dict[str, Dict]:
+        """
+        Get one token's balance for many wallets concurrently
+        
+        Args:
+            token_address: Token contract address
+            wallet_addresses: Wallet addresses
+            abi: Token ABI (optional)
+        
+        Returns:
+            Dict mapping wallet address to balance information (failed lookups are left out)
+        """
+        return self.token_transfer.get_token_balances_bulk(token_address, wallet_addresses, abi)
+    
+    def get_token_info_bulk(self, token_addresses: List[str], abi: list = None) -> Dict[str, Dict]:
+        """
+        Get information for many tokens concurrently
+        
+        Args:
+            token_addresses: Token contract addresses
+            abi: Token ABI (optional)
+        
+        Returns:
+            Dict mapping token address to token information (failed lookups are left out)
+        """
+        return self.token_transfer.get_token_info_bulk(token_addresses, abi)
+    
+    def make_specialized_sender(self, token_address: str, decimals: int, symbol: str,
+                                name: Optional[str] = None) -> Callable[..., Dict]:
+        """
+        Build a send function for one standard ERC-20 token with known decimals
+        
+        Args:
+            token_address: Token contract address
+            decimals: Token decimals
+            symbol: Token symbol
+            name: Token name (optional, defaults to the symbol)
+        
+        Returns:
+            send(private_key, to_address, amount, gas_price=None) without metadata or balance reads
+        """
+        return self.token_transfer.make_specialized_sender(token_address, decimals, symbol, name)
+    
     def validate_address(self, address: str) -> bool:
         """
         Validate if an address is valid
         
         Args:
             address: Address to validate
-            
+        
         Returns:
             True if valid, False otherwise
         """
         try:
-            return self.bnb_transfer.web3.is_address(address)
+            return is_address(address)
         except Exception as e:
-            logger.error(f"Error validating address: {e}")
+            logger.error("Error validating address: %s", e)
             return False
     
     def get_network_info(self) -> Dict:
         """
         Get network information
         
+        The latest block, the gas price (unless the transfer handler's
+        cached price is still fresh) and, on the first call, the chain ID
+        are fetched in one JSON-RPC batch. The gas price is shared with the
+        transfer handler's cache, so the value shown is the one sends use.
+        
         Returns:
-            Dict with network information
+            Dict with network information; connected is False and
+            latest_block None when the node did not answer
         """
         try:
+            gas_price_wei = self.bnb_transfer.cached_gas_price()
+            calls = [("eth_blockNumber", [])]
+            if gas_price_wei is None:
+                calls.append(("eth_gasPrice", []))
+            if self._chain_id is None:
+                calls.append(("eth_chainId", []))
+            
+            connected = True
+            try:
+                results = [rpc_result(response) for response in batch_request(self.web3, calls)]
+                values = {method: int(result, 16) for (method, _), result in zip(calls, results)}
+                latest_block = values["eth_blockNumber"]
+                if gas_price_wei is None:
+                    gas_price_wei = values["eth_gasPrice"]
+                    self.bnb_transfer.cache_gas_price(gas_price_wei)
+                if self._chain_id is None:
+                    self._chain_id = values["eth_chainId"]
+            except Exception as e:
+                logger.warning("Batched network info lookup failed, fetching individually: %s", e)
+                try:
+                    latest_block = self.web3.eth.block_number
+                except Exception as e:
+                    logger.warning("Node did not answer: %s", e)
+                    latest_block = None
+                    connected = False
+                if gas_price_wei is None:
+                    gas_price_wei = self.bnb_transfer.estimate_gas_price()
+            
             return {
-                "connected": self.bnb_transfer.web3.is_connected(),
-                "chain_id": self.bnb_transfer.chain_id,
-                "latest_block": self.bnb_transfer.web3.eth.block_number,
-                "gas_price_wei": self.bnb_transfer.estimate_gas_price(),
-                "gas_price_gwei": self.bnb_transfer.web3.from_wei(
-                    self.bnb_transfer.estimate_gas_price(), 'gwei'
-                ),
+                "connected": connected,
+                "chain_id": self._chain_id if self._chain_id is not None else self.bnb_transfer.chain_id,
+                "latest_block": latest_block,
+                "gas_price_wei": gas_price_wei,
+                "gas_price_gwei": self.bnb_transfer.web3.from_wei(gas_price_wei, 'gwei'),
                 "explorer_url": BSC_TESTNET_EXPLORER
             }
         except Exception as e:
-            logger.error(f"Error getting network info: {e}")
+            logger.error("Error getting network info: %s", e)
             raise
     
     def get_transaction_status(self, tx_hash: str) -> Dict:
@@ -285,7 +559,7 @@ class BSCWallet:
         
         Args:
             tx_hash: Transaction hash
-            
+        
         Returns:
             Dict with transaction information
         """
@@ -318,10 +592,9 @@ class BSCWallet:
                         "status": "Not Found",
                         "explorer_url": f"{BSC_TESTNET_EXPLORER}/tx/{tx_hash}"
                     }
-                    
+        
         except Exception as e:
-            logger.error(f"Error getting transaction status: {e}")
+            logger.error("Error getting transaction status: %s", e)
             raise
 
 
- 
\ No newline at end of file
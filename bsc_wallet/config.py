@@ -2,6 +2,8 @@
 Configuration settings for BSC Testnet wallet operations
 """
 
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+
 # BSC Testnet Configuration
 BSC_TESTNET_RPC_URL = "https://data-seed-prebsc-1-s1.binance.org:8545/"
 BSC_TESTNET_CHAIN_ID = 97
@@ -20,9 +22,34 @@ BIP44_PATH = "m/44'/60'/0'/0/0"
 DEFAULT_GAS_LIMIT = 21000
 TOKEN_TRANSFER_GAS_LIMIT = 100000
 DEFAULT_GAS_PRICE = 20000000000  # 20 Gwei
+GAS_PRICE_CACHE_TTL = 3.0  # seconds, roughly one BSC block
+BALANCE_CACHE_TTL = 3.0  # seconds a sender balance is reused for send_bnb pre-flight checks
+
+# EIP-1559 Fee Settings (set USE_EIP1559 = False for RPCs without eth_feeHistory)
+USE_EIP1559 = True
+FEE_HISTORY_BLOCKS = 5
+FEE_HISTORY_PERCENTILES = [25, 50, 75]
+FEE_HISTORY_CACHE_TTL = 3.0  # seconds
+
+# HTTP Connection Pool Settings
+HTTP_POOL_SIZE = 50  # connections kept alive per RPC host
+HTTP_MAX_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.2  # seconds, urllib3 backoff_factor
+HTTP_RETRY_STATUS_CODES = (429, 502, 503, 504)
+BULK_MAX_WORKERS = 16  # threads used by the bulk token lookups
+BROADCAST_CONCURRENCY = 32  # raw transactions in flight at once in async bulk sends
+HTTP_REQUEST_TIMEOUT = 10  # seconds, same as web3's HTTPProvider default
+USE_HTTP2 = False  # multiplex RPCs over one connection; needs the optional httpx[http2] extra
 
-# Standard ERC-20 ABI for BEP-20 tokens
-ERC20_ABI = [
+# Confirmation Settings
+CONFIRMATION_TIMEOUT = 300  # seconds
+CONFIRMATION_POLL_LATENCY = 0.5  # seconds before the first receipt re-check over HTTP
+CONFIRMATION_POLL_BACKOFF = 1.5  # multiplier applied to the delay after each empty check
+CONFIRMATION_MAX_POLL_INTERVAL = 3.0  # seconds, roughly one BSC block
+CONFIRMATION_MAX_RPC_ERRORS = 3  # transient receipt lookup failures tolerated
+
+# Standard ERC-20 ABI for BEP-20 tokens (a tuple so it cannot be mutated after parsing)
+ERC20_ABI = (
     {
         "constant": True,
         "inputs": [],
@@ -80,11 +107,59 @@ ERC20_ABI = [
         "stateMutability": "view",
         "type": "function"
     }
+)
+
+# 4-byte function selectors of the ERC-20 ABI, keyed by function name
+ERC20_SELECTORS = {
+    fn_abi["name"]: function_abi_to_4byte_selector(fn_abi) for fn_abi in ERC20_ABI
+}
+
+# Multicall3 (same address on every EVM chain, including BSC Testnet)
+MULTICALL3_ADDRESS = to_checksum_address("0xcA11bde05977b3631167028862bE2a173976CA11")
+
+# Minimal Multicall3 ABI: aggregate3 and getEthBalance
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
 ]
 
 # Sample BEP-20 Token Addresses on BSC Testnet
-SAMPLE_TOKENS = {
+_RAW_SAMPLE_TOKENS = {
     "USDT": "0xA11c8D9DC9b66E209Ef60F0C8D969D3CD988782c",  # Sample testnet USDT
     "BUSD": "0xeD24FC36d5Ee211Ea25A80239Fb8C4Cfd80f12Ee",  # Sample testnet BUSD
     "IVP": "0xf3eeCd4b52ef54c15EdF2d5eD525A2d200701041"     # Custom IVP token (Prakash)
-} 
\ No newline at end of file
+}
+
+# Checksummed once at import so callers always get canonical addresses
+SAMPLE_TOKENS = {symbol: to_checksum_address(address) for symbol, address in _RAW_SAMPLE_TOKENS.items()}
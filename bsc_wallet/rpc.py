@@ -0,0 +1,621 @@
+"""
+RPC Provider Module
+Builds Web3 providers for BSC Testnet RPC endpoints and sends batched
+JSON-RPC requests
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import requests
+from eth_utils import keccak
+from hexbytes import HexBytes
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+from web3.middleware import async_geth_poa_middleware, geth_poa_middleware
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from web3.providers import BaseProvider, HTTPProvider, WebsocketProvider
+from web3.types import RPCResponse, TxReceipt
+from .utils import to_checksum_address
+from .config import (
+    HTTP_POOL_SIZE,
+    HTTP_MAX_RETRIES,
+    HTTP_RETRY_BACKOFF,
+    HTTP_RETRY_STATUS_CODES,
+    HTTP_REQUEST_TIMEOUT,
+    USE_HTTP2,
+    CONFIRMATION_TIMEOUT,
+    CONFIRMATION_POLL_LATENCY,
+    CONFIRMATION_POLL_BACKOFF,
+    CONFIRMATION_MAX_POLL_INTERVAL,
+    CONFIRMATION_MAX_RPC_ERRORS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BatchHTTPProvider(HTTPProvider):
+    """
+    HTTPProvider that can also send several JSON-RPC requests in one POST
+    
+    Every request goes through the provider's own requests session.
+    web3's default path caches sessions per thread, so worker threads
+    would otherwise each get a plain session without the pool or retries.
+    """
+    
+    def __init__(self, endpoint_uri: str, request_kwargs: Optional[Dict[str, Any]] = None,
+                 session: Optional[requests.Session] = None):
+        """
+        Initialize the provider
+        
+        Args:
+            endpoint_uri: HTTP(S) RPC endpoint URL
+            request_kwargs: Extra keyword arguments for session.post (e.g. timeout)
+            session: requests session shared by all threads (optional, created when omitted)
+        """
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs)
+        self._session = session if session is not None else create_session()
+    
+    def make_request(self, method: str, params: Any) -> RPCResponse:
+        """
+        Send a single JSON-RPC request
+        
+        Args:
+            method: JSON-RPC method name
+            params: Method parameters
+        
+        Returns:
+            Decoded JSON-RPC response
+        """
+        return self.decode_rpc_response(self._post(self.encode_rpc_request(method, params)))
+    
+    def make_batch_request(self, calls: Sequence[Tuple[str, Any]]) -> List[RPCResponse]:
+        """
+        Send a JSON-RPC batch over a single HTTP round-trip
+        
+        Args:
+            calls: Sequence of (method, params) pairs
+        
+        Returns:
+            Raw JSON-RPC responses in the same order as the requests
+        """
+        payload = [
+            {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+            for request_id, (method, params) in enumerate(calls)
+        ]
+        responses = json.loads(self._post(json.dumps(payload).encode("utf-8")))
+        
+        # Nodes that reject a batch answer with a single error object
+        if not isinstance(responses, list):
+            raise ValueError(responses.get("error", responses))
+        
+        return sorted(responses, key=lambda response: response["id"])
+    
+    def _post(self, request_data: bytes) -> bytes:
+        """
+        POST an encoded JSON-RPC payload to the endpoint
+        
+        Args:
+            request_data: Encoded request or batch
+        
+        Returns:
+            Raw response body
+        """
+        response = self._session.post(self.endpoint_uri, data=request_data, **self.get_request_kwargs())
+        response.raise_for_status()
+        return response.content
+
+
+class HTTP2Provider(BatchHTTPProvider):
+    """
+    BatchHTTPProvider that sends requests through an HTTP/2 httpx client
+    
+    Concurrent calls from several threads are multiplexed as streams over
+    one connection instead of each holding a pooled HTTP/1.1 connection.
+    """
+    
+    def __init__(self, endpoint_uri: str, client: Optional[Any] = None, pool_size: int = HTTP_POOL_SIZE):
+        """
+        Initialize the HTTP/2 provider
+        
+        Args:
+            endpoint_uri: HTTP(S) RPC endpoint URL
+            client: httpx.Client to reuse (optional)
+            pool_size: Maximum connections when creating our own client
+        """
+        super().__init__(endpoint_uri)
+        self.client = client if client is not None else create_http2_client(pool_size)
+    
+    def make_request(self, method: str, params: Any) -> RPCResponse:
+        """
+        Send a single JSON-RPC request
+        
+        Args:
+            method: JSON-RPC method name
+            params: Method parameters
+        
+        Returns:
+            Decoded JSON-RPC response
+        """
+        return self.decode_rpc_response(self._post(self.encode_rpc_request(method, params)))
+    
+    def _post(self, request_data: bytes) -> bytes:
+        response = self.client.post(self.endpoint_uri, content=request_data, headers=self.get_request_headers())
+        response.raise_for_status()
+        return response.content
+
+
+class AsyncHTTP2Provider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that sends requests through an HTTP/2 httpx client
+    """
+    
+    def __init__(self, endpoint_uri: str, client: Optional[Any] = None, pool_size: int = HTTP_POOL_SIZE):
+        """
+        Initialize the async HTTP/2 provider
+        
+        Args:
+            endpoint_uri: HTTP(S) RPC endpoint URL
+            client: httpx.AsyncClient to reuse (optional)
+            pool_size: Maximum connections when creating our own client
+        """
+        super().__init__(endpoint_uri)
+        if client is None:
+            httpx = _import_httpx()
+            client = httpx.AsyncClient(http2=True, timeout=HTTP_REQUEST_TIMEOUT, limits=_http2_limits(httpx, pool_size))
+        self.client = client
+    
+    async def make_request(self, method: str, params: Any) -> RPCResponse:
+        """
+        Send a single JSON-RPC request
+        
+        Args:
+            method: JSON-RPC method name
+            params: Method parameters
+        
+        Returns:
+            Decoded JSON-RPC response
+        """
+        response = await self.client.post(
+            self.endpoint_uri, content=self.encode_rpc_request(method, params), headers=self.get_request_headers()
+        )
+        response.raise_for_status()
+        return self.decode_rpc_response(response.content)
+
+
+def _import_httpx():
+    """
+    Import httpx, which is only needed for the optional HTTP/2 transport
+    
+    Returns:
+        The httpx module
+    """
+    try:
+        import httpx
+    except ImportError:
+        raise ImportError("HTTP/2 transport requires httpx: pip install 'httpx[http2]'")
+    return httpx
+
+
+def _http2_limits(httpx, pool_size: int):
+    return httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+
+
+def create_http2_client(pool_size: int = HTTP_POOL_SIZE):
+    """
+    Create an httpx client that speaks HTTP/2 to RPC endpoints
+    
+    Args:
+        pool_size: Maximum number of connections
+    
+    Returns:
+        httpx.Client with HTTP/2 enabled
+    """
+    httpx = _import_httpx()
+    return httpx.Client(http2=True, timeout=HTTP_REQUEST_TIMEOUT, limits=_http2_limits(httpx, pool_size))
+
+
+def is_websocket_url(rpc_url: str) -> bool:
+    """
+    Check whether an RPC URL points at a WebSocket endpoint
+    
+    Args:
+        rpc_url: RPC endpoint URL
+    
+    Returns:
+        True for ws:// and wss:// URLs, False otherwise
+    """
+    return rpc_url.lower().startswith(("ws://", "wss://"))
+
+
+def create_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """
+    Create a requests session with an enlarged keep-alive connection pool
+    
+    JSON-RPC is always POST, so retries are enabled for POST. A retry can
+    resend eth_sendRawTransaction after a proxy error even though the node
+    already accepted the first attempt; send_raw_transaction treats the
+    node's duplicate reply as success.
+    
+    Args:
+        pool_size: Number of pooled connections per host
+    
+    Returns:
+        Configured requests session
+    """
+    retry = Retry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["POST"])
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def make_provider(rpc_url: str, session: Optional[requests.Session] = None,
+                  http2: bool = USE_HTTP2) -> BaseProvider:
+    """
+    Create the Web3 provider matching the RPC URL scheme
+    
+    Args:
+        rpc_url: RPC endpoint URL (http(s):// or ws(s)://)
+        session: requests session to reuse for HTTP/1.1 endpoints (optional)
+        http2: Use the httpx HTTP/2 transport for HTTP endpoints
+    
+    Returns:
+        WebsocketProvider for WebSocket URLs, HTTP2Provider or BatchHTTPProvider otherwise
+    """
+    if is_websocket_url(rpc_url):
+        return Web3.WebsocketProvider(rpc_url)
+    if http2:
+        return HTTP2Provider(rpc_url)
+    return BatchHTTPProvider(rpc_url, request_kwargs={"timeout": HTTP_REQUEST_TIMEOUT}, session=session)
+
+
+def create_web3(rpc_url: str, session: Optional[requests.Session] = None, http2: bool = USE_HTTP2) -> Web3:
+    """
+    Create a Web3 instance for BSC with the POA middleware injected
+    
+    Args:
+        rpc_url: RPC endpoint URL (http(s):// or ws(s)://)
+        session: requests session to reuse for HTTP/1.1 endpoints (optional)
+        http2: Use the httpx HTTP/2 transport for HTTP endpoints
+    
+    Returns:
+        Web3 instance ready to be shared between handlers
+    """
+    web3 = Web3(make_provider(rpc_url, session=session, http2=http2))
+    
+    # Add POA middleware for BSC (Proof of Authority chain)
+    web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+    logger.info("POA middleware injected for BSC compatibility")
+    
+    return web3
+
+
+def create_async_web3(rpc_url: str, http2: bool = USE_HTTP2) -> AsyncWeb3:
+    """
+    Create an AsyncWeb3 instance for BSC with the POA middleware injected
+    
+    Args:
+        rpc_url: HTTP(S) RPC endpoint URL
+        http2: Use the httpx HTTP/2 transport
+    
+    Returns:
+        AsyncWeb3 instance backed by AsyncHTTP2Provider or AsyncHTTPProvider
+    """
+    provider = AsyncHTTP2Provider(rpc_url) if http2 else AsyncHTTPProvider(rpc_url)
+    web3 = AsyncWeb3(provider)
+    web3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
+    return web3
+
+
+def endpoint_of(web3: Union[Web3, AsyncWeb3]) -> str:
+    """
+    Get the endpoint URL a Web3 instance is connected to
+    
+    Args:
+        web3: Web3 instance
+    
+    Returns:
+        Endpoint URL, or the provider description if it has none
+    """
+    return str(getattr(web3.provider, "endpoint_uri", web3.provider))
+
+
+def batch_request(web3: Web3, calls: Sequence[Tuple[str, Any]]) -> List[RPCResponse]:
+    """
+    Send JSON-RPC requests as one batch when the provider supports it
+    
+    Providers without batch support (e.g. WebSocket) get the requests one
+    by one, so callers can use this unconditionally. Middleware is not
+    applied to the responses.
+    
+    Args:
+        web3: Connected Web3 instance
+        calls: Sequence of (method, params) pairs
+    
+    Returns:
+        Raw JSON-RPC responses in the same order as the requests
+    """
+    provider = web3.provider
+    if isinstance(provider, BatchHTTPProvider):
+        return provider.make_batch_request(calls)
+    return [provider.make_request(method, params) for method, params in calls]
+
+
+def rpc_result(response: RPCResponse) -> Any:
+    """
+    Extract the result of a raw JSON-RPC response
+    
+    Args:
+        response: Response returned by batch_request
+    
+    Returns:
+        The response result
+    """
+    if response.get("error"):
+        raise ValueError(response["error"])
+    return response["result"]
+
+
+def _duplicate_broadcast_reply(error: Exception) -> Optional[bool]:
+    """
+    Classify a broadcast failure that may mean the node already has the transaction
+    
+    Args:
+        error: Exception raised by send_raw_transaction
+    
+    Returns:
+        True for "already known" replies, None for "nonce too low" (a
+        duplicate only if the node has the same transaction), False otherwise
+    """
+    message = str(error).lower()
+    if "already known" in message or "known transaction" in message:
+        return True
+    if "nonce too low" in message:
+        return None
+    return False
+
+
+def _is_duplicate_broadcast(web3: Web3, error: Exception, tx_hash: HexBytes) -> bool:
+    """
+    Check whether a broadcast failed only because the node already has the transaction
+    
+    Args:
+        web3: Connected Web3 instance
+        error: Exception raised by send_raw_transaction
+        tx_hash: Hash of the signed transaction that was sent
+    
+    Returns:
+        True for "already known" replies, and for "nonce too low" when the
+        same transaction has since been seen by the node
+    """
+    duplicate = _duplicate_broadcast_reply(error)
+    if duplicate is not None:
+        return duplicate
+    
+    try:
+        web3.eth.get_transaction(tx_hash)
+        return True
+    except Exception:
+        return False
+
+
+def send_raw_transaction(web3: Web3, signed_transaction: Union[bytes, str]) -> str:
+    """
+    Broadcast a signed transaction, tolerating a retried POST that already delivered it
+    
+    Args:
+        web3: Connected Web3 instance
+        signed_transaction: Signed raw transaction (bytes, or a hex string)
+    
+    Returns:
+        Transaction hash (hex string)
+    """
+    raw_transaction = HexBytes(signed_transaction)
+    try:
+        return web3.eth.send_raw_transaction(raw_transaction).hex()
+    except Exception as e:
+        tx_hash = HexBytes(keccak(raw_transaction))
+        if not _is_duplicate_broadcast(web3, e, tx_hash):
+            raise
+        logger.info("Transaction %s was already accepted by the node", tx_hash.hex())
+        return tx_hash.hex()
+
+
+async def send_raw_transaction_async(web3: AsyncWeb3, signed_transaction: Union[bytes, str]) -> str:
+    """
+    AsyncWeb3 counterpart of send_raw_transaction
+    
+    Args:
+        web3: Connected AsyncWeb3 instance
+        signed_transaction: Signed raw transaction (bytes, or a hex string)
+    
+    Returns:
+        Transaction hash (hex string)
+    """
+    raw_transaction = HexBytes(signed_transaction)
+    try:
+        return (await web3.eth.send_raw_transaction(raw_transaction)).hex()
+    except Exception as e:
+        tx_hash = HexBytes(keccak(raw_transaction))
+        duplicate = _duplicate_broadcast_reply(e)
+        if duplicate is None:
+            try:
+                await web3.eth.get_transaction(tx_hash)
+                duplicate = True
+            except Exception:
+                duplicate = False
+        if not duplicate:
+            raise
+        logger.info("Transaction %s was already accepted by the node", tx_hash.hex())
+        return tx_hash.hex()
+
+
+def _create_block_filter(web3: Web3):
+    """
+    Create a new-block filter when connected over WebSocket
+    
+    Args:
+        web3: Connected Web3 instance
+    
+    Returns:
+        Block filter, or None to fall back to receipt polling
+    """
+    if not isinstance(web3.provider, WebsocketProvider):
+        return None
+    
+    try:
+        return web3.eth.filter("latest")
+    except Exception as e:
+        logger.warning("Block filter unavailable, falling back to polling: %s", e)
+        return None
+
+
+def wait_for_receipt(web3: Web3, tx_hash: str, timeout: float = CONFIRMATION_TIMEOUT) -> TxReceipt:
+    """
+    Wait for a transaction receipt without busy-polling the node
+    
+    The delay between checks starts at CONFIRMATION_POLL_LATENCY and grows
+    by CONFIRMATION_POLL_BACKOFF up to CONFIRMATION_MAX_POLL_INTERVAL
+    (about one BSC block). Over WebSocket those checks go to a new-block
+    filter and the receipt is only re-fetched once a block arrives; over
+    HTTP the receipt itself is polled. Up to CONFIRMATION_MAX_RPC_ERRORS
+    failed lookups are retried.
+    
+    Args:
+        web3: Connected Web3 instance
+        tx_hash: Transaction hash
+        timeout: Timeout in seconds
+    
+    Returns:
+        Transaction receipt
+    """
+    deadline = time.time() + timeout
+    block_filter = _create_block_filter(web3)
+    try:
+        delay = CONFIRMATION_POLL_LATENCY
+        rpc_errors = 0
+        while True:
+            try:
+                return web3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                # Transaction not yet mined
+                pass
+            except Exception as e:
+                rpc_errors += 1
+                if rpc_errors > CONFIRMATION_MAX_RPC_ERRORS:
+                    raise
+                logger.warning("Error fetching receipt (%s/%s), retrying: %s", rpc_errors, CONFIRMATION_MAX_RPC_ERRORS, e)
+            
+            if time.time() >= deadline:
+                raise TimeExhausted(f"Transaction {tx_hash} is not in the chain after {timeout} seconds")
+            
+            time.sleep(min(delay, max(deadline - time.time(), 0)))
+            delay = min(delay * CONFIRMATION_POLL_BACKOFF, CONFIRMATION_MAX_POLL_INTERVAL)
+            
+            if block_filter is not None:
+                # Keep backing off until the filter reports a block
+                while time.time() < deadline and not block_filter.get_new_entries():
+                    time.sleep(min(delay, max(deadline - time.time(), 0)))
+                    delay = min(delay * CONFIRMATION_POLL_BACKOFF, CONFIRMATION_MAX_POLL_INTERVAL)
+    finally:
+        if block_filter is not None:
+            try:
+                web3.eth.uninstall_filter(block_filter.filter_id)
+            except Exception:
+                pass
+
+
+class NonceManager:
+    """
+    Hands out consecutive nonces per sender from a single seed RPC
+    
+    The first allocation for an address seeds the counter from the node's
+    pending transaction count; later allocations increment it locally, so
+    back-to-back and bulk sends do not call eth_getTransactionCount per
+    transaction. One instance can be shared by every handler sending from
+    the same accounts so BNB and token sends never reuse a nonce.
+    
+    Transactions sent from the same account by anything else (another
+    process, wallet or machine) invalidate the cached counter. Pass the
+    node's pending count as pending_nonce when it is at hand, or call
+    reset() after a "nonce too low" rejection, to resync.
+    """
+    
+    def __init__(self, web3: Web3):
+        """
+        Initialize nonce manager
+        
+        Args:
+            web3: Connected Web3 instance used to seed counters
+        """
+        self.web3 = web3
+        
+        # Next nonce to hand out per checksum sender address
+        self._next_nonces: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def allocate(self, address: str, count: int = 1, pending_nonce: Optional[int] = None) -> int:
+        """
+        Reserve consecutive nonces for a sender
+        
+        Args:
+            address: Sender address
+            count: Number of nonces to reserve
+            pending_nonce: Pending transaction count already fetched by the
+                caller (optional); saves the seed RPC and resyncs the counter
+                if another client has sent from the account since
+        
+        Returns:
+            First reserved nonce; the rest follow consecutively
+        """
+        address = to_checksum_address(address)
+        with self._lock:
+            nonce = self._next_nonces.get(address)
+            if nonce is None:
+                if pending_nonce is None:
+                    pending_nonce = self.web3.eth.get_transaction_count(address, 'pending')
+                nonce = pending_nonce
+            elif pending_nonce is not None:
+                nonce = max(nonce, pending_nonce)
+            self._next_nonces[address] = nonce + count
+            return nonce
+    
+    def next(self, address: str, pending_nonce: Optional[int] = None) -> int:
+        """
+        Reserve the next nonce for a sender
+        
+        Args:
+            address: Sender address
+            pending_nonce: Pending transaction count already fetched (optional)
+        
+        Returns:
+            Nonce to use for the next transaction
+        """
+        return self.allocate(address, 1, pending_nonce)
+    
+    def reset(self, address: Optional[str] = None) -> None:
+        """
+        Forget reserved nonces so the next allocation resyncs from the node
+        
+        Call after a reserved nonce goes unused (failed signing or broadcast)
+        so later transactions do not leave a gap.
+        
+        Args:
+            address: Sender address to reset (all senders when omitted)
+        """
+        with self._lock:
+            if address is None:
+                self._next_nonces.clear()
+            else:
+                self._next_nonces.pop(to_checksum_address(address), None)
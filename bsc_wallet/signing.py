@@ -0,0 +1,94 @@
+"""
+Signing Module
+Batch signing of legacy (EIP-155) transactions with one reused secp256k1 key
+"""
+
+from typing import Dict, List, Sequence, Union
+import rlp
+from coincurve import PrivateKey
+from eth_account.signers.local import LocalAccount
+from eth_utils import keccak
+from .utils import resolve_account
+
+
+def _to_bytes(value: Union[bytes, str, None]) -> bytes:
+    """
+    Normalize an address or calldata field to bytes
+    
+    Args:
+        value: Bytes, hex string (0x prefix optional) or None
+    
+    Returns:
+        Raw bytes (empty for None)
+    """
+    if value is None:
+        return b""
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith(("0x", "0X")) else value)
+    return bytes(value)
+
+
+class BatchSigner:
+    """
+    Signs many legacy transactions from one sender
+    
+    The coincurve key is built once and every transaction is RLP-encoded,
+    hashed and signed directly, skipping eth_account's per-call transaction
+    validation and model objects. Output is byte-identical to
+    LocalAccount.sign_transaction; typed (EIP-2718) and pre-EIP-155
+    transactions fall back to it.
+    """
+    
+    def __init__(self, private_key: Union[str, LocalAccount]):
+        """
+        Initialize batch signer
+        
+        Args:
+            private_key: Sender's private key (hex string) or LocalAccount
+        """
+        self.account = resolve_account(private_key)
+        self.address = self.account.address
+        self._key = PrivateKey(bytes(self.account.key))
+    
+    def sign(self, transaction: Dict) -> bytes:
+        """
+        Sign one transaction
+        
+        Args:
+            transaction: Transaction dict with nonce, gasPrice, gas, to, value,
+                data and chainId
+        
+        Returns:
+            Signed raw transaction bytes
+        """
+        if 'gasPrice' not in transaction or 'chainId' not in transaction or 'type' in transaction:
+            return bytes(self.account.sign_transaction(transaction).rawTransaction)
+        
+        fields = [
+            transaction['nonce'],
+            transaction['gasPrice'],
+            transaction['gas'],
+            _to_bytes(transaction.get('to')),
+            transaction.get('value', 0),
+            _to_bytes(transaction.get('data'))
+        ]
+        chain_id = transaction['chainId']
+        
+        # EIP-155 signing hash commits to (chainId, 0, 0) in place of (v, r, s)
+        signature = self._key.sign_recoverable(keccak(rlp.encode(fields + [chain_id, 0, 0])), hasher=None)
+        v = signature[64] + 35 + 2 * chain_id
+        r = int.from_bytes(signature[:32], 'big')
+        s = int.from_bytes(signature[32:64], 'big')
+        return rlp.encode(fields + [v, r, s])
+    
+    def sign_all(self, transactions: Sequence[Dict]) -> List[bytes]:
+        """
+        Sign transactions in order
+        
+        Args:
+            transactions: Transaction dicts
+        
+        Returns:
+            Signed raw transaction bytes in the same order
+        """
+        return [self.sign(transaction) for transaction in transactions]
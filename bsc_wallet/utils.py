@@ -0,0 +1,77 @@
+"""
+Utility Module
+Cached address and account helpers shared by the wallet modules
+"""
+
+import functools
+from typing import Union
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from eth_utils import is_address as _eth_is_address
+from eth_utils import to_checksum_address as _eth_to_checksum_address
+
+
+@functools.lru_cache(maxsize=4096)
+def is_address(address: str) -> bool:
+    """
+    Check whether a value is a valid address, caching the result
+    
+    Checksum validation hashes the address with keccak256, so repeated
+    checks of the same wallet or token address are served from the cache.
+    
+    Args:
+        address: Address to validate
+        
+    Returns:
+        True if valid, False otherwise
+    """
+    return _eth_is_address(address)
+
+
+@functools.lru_cache(maxsize=4096)
+def to_checksum_address(address: str) -> str:
+    """
+    Convert an address to its EIP-55 checksum form, caching the result
+    
+    Args:
+        address: Hex address
+        
+    Returns:
+        Checksummed address
+    """
+    return _eth_to_checksum_address(address)
+
+
+@functools.lru_cache(maxsize=32)
+def _account_for_key(private_key: str) -> LocalAccount:
+    """
+    Derive the account for a private key, remembering recently used keys
+    
+    Deriving the public key and address is a secp256k1 multiplication plus
+    a keccak hash, which repeated sends from one key would otherwise redo.
+    
+    Args:
+        private_key: Private key (hex string)
+        
+    Returns:
+        LocalAccount for the key
+    """
+    return Account.from_key(private_key)
+
+
+def resolve_account(private_key: Union[str, LocalAccount]) -> LocalAccount:
+    """
+    Get the LocalAccount for a private key or pass an account through
+    
+    Passing a LocalAccount skips derivation and keeps the key out of the
+    module-level cache.
+    
+    Args:
+        private_key: Private key (hex string) or LocalAccount
+        
+    Returns:
+        LocalAccount for the key
+    """
+    if isinstance(private_key, LocalAccount):
+        return private_key
+    return _account_for_key(private_key)
@@ -3,17 +3,147 @@ Wallet Generation Module
 Handles BIP39 mnemonic generation and BIP44 key derivation for BSC Testnet
 """
 
+import hashlib
+import hmac
 import logging
-from typing import Dict, Tuple
+import unicodedata
+from typing import Dict, Iterable, List, Tuple
 from mnemonic import Mnemonic
-from bip_utils import Bip39SeedGenerator, Bip44, Bip44Coins, Bip44Changes
+from coincurve import PrivateKey
 from eth_account import Account
-from .config import BIP44_PATH
+from eth_utils import keccak, to_checksum_address
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The BIP39 English wordlist is read from disk once and shared by every generator
+_MNEMO = Mnemonic("english")
+_WORDSET = frozenset(_MNEMO.wordlist)
+
+# secp256k1 group order and the BIP32 hardened index offset
+_SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+_HARDENED = 0x80000000
+
+
+def _public_key_and_address(private_key_bytes: bytes) -> Tuple[str, str]:
+    """
+    Uncompressed public key and checksum address for a private key
+    
+    One secp256k1 multiplication; the address is the last 20 bytes of the
+    keccak256 of the public key without its 0x04 prefix.
+    
+    Args:
+        private_key_bytes: Private key (32 bytes)
+    
+    Returns:
+        (public key hex with 0x prefix, checksum address)
+    """
+    public_key_bytes = PrivateKey(private_key_bytes).public_key.format(compressed=False)[1:]
+    address = to_checksum_address(keccak(public_key_bytes)[-20:])
+    return "0x" + public_key_bytes.hex(), address
+
+
+def _mnemonic_to_seed(mnemonic: str, passphrase: str = "") -> bytes:
+    """
+    BIP39 seed from a mnemonic: PBKDF2-HMAC-SHA512 over the NFKD-normalized
+    phrase with salt "mnemonic" + passphrase and 2048 iterations
+    
+    hashlib runs the whole PBKDF2 loop in OpenSSL without holding the GIL.
+    
+    Args:
+        mnemonic: BIP39 mnemonic phrase
+        passphrase: Optional BIP39 passphrase
+    
+    Returns:
+        64-byte seed
+    """
+    return hashlib.pbkdf2_hmac(
+        "sha512",
+        unicodedata.normalize("NFKD", mnemonic).encode("utf-8"),
+        b"mnemonic" + unicodedata.normalize("NFKD", passphrase).encode("utf-8"),
+        2048
+    )
+
+
+def _ckd_priv(key: bytes, chain_code: bytes, index: int) -> Tuple[bytes, bytes]:
+    """
+    BIP32 private child key derivation (CKDpriv)
+    
+    Args:
+        key: Parent private key (32 bytes)
+        chain_code: Parent chain code (32 bytes)
+        index: Child index (>= 2**31 for hardened children)
+    
+    Returns:
+        (child private key, child chain code)
+    """
+    if index >= _HARDENED:
+        data = b"\x00" + key + index.to_bytes(4, "big")
+    else:
+        data = PrivateKey(key).public_key.format(compressed=True) + index.to_bytes(4, "big")
+    return _child_from_digest(key, hmac.new(chain_code, data, hashlib.sha512).digest())
+
+
+def _child_from_digest(key: bytes, digest: bytes) -> Tuple[bytes, bytes]:
+    """
+    Turn a CKDpriv HMAC-SHA512 digest into the child key and chain code
+    
+    Args:
+        key: Parent private key (32 bytes)
+        digest: HMAC-SHA512 output for the child
+    
+    Returns:
+        (child private key, child chain code)
+    """
+    tweak = int.from_bytes(digest[:32], "big")
+    child = (tweak + int.from_bytes(key, "big")) % _SECP256K1_N
+    if tweak >= _SECP256K1_N or child == 0:
+        # Probability below 2**-127; BIP32 says to skip such indices
+        raise ValueError("Derived an invalid BIP32 child key")
+    return child.to_bytes(32, "big"), digest[32:]
+
+
+def _derive_eth_keys(seed: bytes, account: int, indices: Iterable[int]) -> List[bytes]:
+    """
+    Derive private keys for m/44'/60'/account'/0/index from a BIP39 seed
+    
+    The four levels down to the external chain node are derived once;
+    each address index then costs one HMAC-SHA512, since the serialized
+    parent public key is shared by all non-hardened children.
+    
+    Args:
+        seed: 64-byte BIP39 seed
+        account: BIP44 account index
+        indices: Address indices to derive
+    
+    Returns:
+        Private keys (32 bytes each) in index order
+    """
+    digest = hmac.new(b"Bitcoin seed", seed, hashlib.sha512).digest()
+    key, chain_code = digest[:32], digest[32:]
+    for index in (44 + _HARDENED, 60 + _HARDENED, account + _HARDENED, 0):
+        key, chain_code = _ckd_priv(key, chain_code, index)
+    
+    parent_public_key = PrivateKey(key).public_key.format(compressed=True)
+    return [
+        _child_from_digest(key, hmac.new(chain_code, parent_public_key + index.to_bytes(4, "big"), hashlib.sha512).digest())[0]
+        for index in indices
+    ]
+
+
+def _derive_eth(seed: bytes, account: int, index: int) -> bytes:
+    """
+    Derive the private key for m/44'/60'/account'/0/index from a BIP39 seed
+    
+    Args:
+        seed: 64-byte BIP39 seed
+        account: BIP44 account index
+        index: Address index
+    
+    Returns:
+        Private key (32 bytes)
+    """
+    return _derive_eth_keys(seed, account, (index,))[0]
+
 
 class WalletGenerator:
     """
@@ -21,7 +151,7 @@ class WalletGenerator:
     """
     
     def __init__(self):
-        self.mnemo = Mnemonic("english")
+        self.mnemo = _MNEMO
     
     def generate_mnemonic(self, strength: int = 128) -> str:
         """
@@ -29,34 +159,58 @@ class WalletGenerator:
         
         Args:
             strength: Entropy strength in bits (128 = 12 words, 256 = 24 words)
-            
+        
         Returns:
             str: Generated mnemonic phrase
         """
-        try:
-            mnemonic = self.mnemo.generate(strength=strength)
-            logger.info(f"Generated new mnemonic with {len(mnemonic.split())} words")
-            return mnemonic
-        except Exception as e:
-            logger.error(f"Error generating mnemonic: {e}")
-            raise
+        mnemonic = self.mnemo.generate(strength=strength)
+        logger.info("Generated new mnemonic with %s words", len(mnemonic.split()))
+        return mnemonic
     
     def validate_mnemonic(self, mnemonic: str) -> bool:
         """
         Validate a mnemonic phrase
         
+        Phrases containing a word outside the BIP39 wordlist are rejected by
+        a set lookup before the full checksum check.
+        
         Args:
             mnemonic: Mnemonic phrase to validate
-            
+        
         Returns:
             bool: True if valid, False otherwise
         """
         try:
+            words = self.mnemo.normalize_string(mnemonic).split(" ")
+            if not all(word in _WORDSET for word in words):
+                return False
             return self.mnemo.check(mnemonic)
         except Exception as e:
-            logger.error(f"Error validating mnemonic: {e}")
+            logger.error("Error validating mnemonic: %s", e)
             return False
     
+    def _wallet_info(self, mnemonic: str, private_key_bytes: bytes, bip44_path: str) -> Dict[str, str]:
+        """
+        Build the wallet dict for a derived private key
+        
+        Args:
+            mnemonic: BIP39 mnemonic phrase
+            private_key_bytes: Derived private key (32 bytes)
+            bip44_path: Derivation path of the key
+        
+        Returns:
+            Dict containing mnemonic, private_key, public_key, address and bip44_path
+        """
+        public_key, address = _public_key_and_address(private_key_bytes)
+        
+        return {
+            "mnemonic": mnemonic,
+            "private_key": private_key_bytes.hex(),
+            "public_key": public_key,
+            "address": address,
+            "bip44_path": bip44_path
+        }
+    
     def derive_wallet_from_mnemonic(self, mnemonic: str, account_index: int = 0) -> Dict[str, str]:
         """
         Derive wallet keys and address from mnemonic using BIP44 standard
@@ -64,47 +218,51 @@ class WalletGenerator:
         Args:
             mnemonic: BIP39 mnemonic phrase
             account_index: Account index for BIP44 path (default: 0)
-            
+        
         Returns:
             Dict containing mnemonic, private_key, public_key, and address
         """
-        try:
-            if not self.validate_mnemonic(mnemonic):
-                raise ValueError("Invalid mnemonic phrase")
-            
-            # Generate seed from mnemonic
-            seed_bytes = Bip39SeedGenerator(mnemonic).Generate()
-            
-            # Use BIP44 for Ethereum (BSC is Ethereum-compatible)
-            bip44_mst_ctx = Bip44.FromSeed(seed_bytes, Bip44Coins.ETHEREUM)
-            bip44_acc_ctx = bip44_mst_ctx.Purpose().Coin().Account(account_index)
-            bip44_chg_ctx = bip44_acc_ctx.Change(Bip44Changes.CHAIN_EXT)
-            bip44_addr_ctx = bip44_chg_ctx.AddressIndex(0)
-            
-            # Get private key
-            private_key_bytes = bip44_addr_ctx.PrivateKey().Raw().ToBytes()
-            private_key_hex = private_key_bytes.hex()
-            
-            # Create account from private key
-            account = Account.from_key(private_key_hex)
-            
-            # Get public key
-            public_key = account._key_obj.public_key.to_hex()
-            
-            wallet_info = {
-                "mnemonic": mnemonic,
-                "private_key": private_key_hex,
-                "public_key": public_key,
-                "address": account.address,
-                "bip44_path": f"m/44'/60'/0'/0/{account_index}"
-            }
-            
-            logger.info(f"Successfully derived wallet for address: {account.address}")
-            return wallet_info
-            
-        except Exception as e:
-            logger.error(f"Error deriving wallet from mnemonic: {e}")
-            raise
+        if not self.validate_mnemonic(mnemonic):
+            raise ValueError("Invalid mnemonic phrase")
+        
+        # Generate seed from mnemonic
+        seed_bytes = _mnemonic_to_seed(mnemonic)
+        
+        # BIP44 path for Ethereum (BSC is Ethereum-compatible)
+        private_key_bytes = _derive_eth(seed_bytes, account_index, 0)
+        wallet_info = self._wallet_info(mnemonic, private_key_bytes, f"m/44'/60'/{account_index}'/0/0")
+        
+        logger.info("Successfully derived wallet for address: %s", wallet_info['address'])
+        return wallet_info
+    
+    def derive_wallets_from_mnemonic(self, mnemonic: str, count: int, account_index: int = 0) -> List[Dict[str, str]]:
+        """
+        Derive several addresses of one BIP44 account from a mnemonic
+        
+        Derives m/44'/60'/account_index'/0/i for i in 0..count-1. The account
+        node is derived once, so each extra address costs one HMAC-SHA512.
+        
+        Args:
+            mnemonic: BIP39 mnemonic phrase
+            count: Number of addresses to derive
+            account_index: Account index for BIP44 path (default: 0)
+        
+        Returns:
+            List of wallet dicts in address index order
+        """
+        if not self.validate_mnemonic(mnemonic):
+            raise ValueError("Invalid mnemonic phrase")
+        
+        seed_bytes = _mnemonic_to_seed(mnemonic)
+        private_keys = _derive_eth_keys(seed_bytes, account_index, range(count))
+        
+        wallets = [
+            self._wallet_info(mnemonic, private_key_bytes, f"m/44'/60'/{account_index}'/0/{index}")
+            for index, private_key_bytes in enumerate(private_keys)
+        ]
+        
+        logger.info("Successfully derived %s wallets for account %s", len(wallets), account_index)
+        return wallets
     
     def create_new_wallet(self, strength: int = 128) -> Dict[str, str]:
         """
@@ -116,12 +274,8 @@ class WalletGenerator:
         Returns:
             Dict containing all wallet information
         """
-        try:
-            mnemonic = self.generate_mnemonic(strength)
-            return self.derive_wallet_from_mnemonic(mnemonic)
-        except Exception as e:
-            logger.error(f"Error creating new wallet: {e}")
-            raise
+        mnemonic = self.generate_mnemonic(strength)
+        return self.derive_wallet_from_mnemonic(mnemonic)
     
     def import_wallet_from_private_key(self, private_key: str) -> Dict[str, str]:
         """
@@ -129,35 +283,29 @@ class WalletGenerator:
         
         Args:
             private_key: Hexadecimal private key string
-            
+        
         Returns:
             Dict containing wallet information
         """
-        try:
-            # Remove '0x' prefix if present
-            if private_key.startswith('0x'):
-                private_key = private_key[2:]
-            
-            # Create account from private key
-            account = Account.from_key(private_key)
-            
-            # Get public key
-            public_key = account._key_obj.public_key.to_hex()
-            
-            wallet_info = {
-                "mnemonic": "N/A (imported from private key)",
-                "private_key": private_key,
-                "public_key": public_key,
-                "address": account.address,
-                "bip44_path": "N/A (imported from private key)"
-            }
-            
-            logger.info(f"Successfully imported wallet for address: {account.address}")
-            return wallet_info
-            
-        except Exception as e:
-            logger.error(f"Error importing wallet from private key: {e}")
-            raise
+        # Remove '0x' prefix if present
+        if private_key.startswith('0x'):
+            private_key = private_key[2:]
+        
+        # Create account from private key
+        account = Account.from_key(private_key)
+        
+        # Get public key
+        public_key = account._key_obj.public_key.to_hex()
+        
+        wallet_info = {
+            "mnemonic": "N/A (imported from private key)",
+            "private_key": private_key,
+            "public_key": public_key,
+            "address": account.address,
+            "bip44_path": "N/A (imported from private key)"
+        }
+        
+        logger.info("Successfully imported wallet for address: %s", account.address)
+        return wallet_info
 
 
- 
\ No newline at end of file
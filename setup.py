@@ -47,6 +47,13 @@ setup(
             "flake8>=3.8",
             "isort>=5.0",
         ],
+        "http2": [
+            "httpx[http2]>=0.24",
+        ],
+        "fast": [
+            "numba>=0.57",
+            "numpy>=1.22",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -5,11 +5,13 @@ Web interface for BSC Testnet wallet operations
 """
 
 import streamlit as st
-import json
-import time
+import logging
 from bsc_wallet.bsc_wallet import BSCWallet
 from bsc_wallet.config import SAMPLE_TOKENS, BSC_TESTNET_EXPLORER
 
+# The library leaves logging configuration to the application
+logging.basicConfig(level=logging.INFO)
+
 # Page config
 st.set_page_config(
     page_title="BSC Testnet Wallet",
@@ -18,30 +20,490 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Navigation pages, in sidebar order
+PAGES = ("🏠 Home", "🆕 Generate Wallet", "📥 Import Wallet", "💰 Check Balances",
+         "🚀 Send BNB", "🪙 Send Tokens", "ℹ️ Network Info")
+
+# Sample token views, built once instead of on every rerun
+SAMPLE_TOKEN_NAMES = tuple(SAMPLE_TOKENS.keys())
+SAMPLE_TOKEN_ITEMS = tuple(SAMPLE_TOKENS.items())
+HAS_SAMPLE_TOKENS = bool(SAMPLE_TOKENS)
+
 # Initialize session state
 if 'wallet' not in st.session_state:
     st.session_state.wallet = None
-if 'bsc_wallet' not in st.session_state:
-    st.session_state.bsc_wallet = BSCWallet()
+if 'wallet_rev' not in st.session_state:
+    st.session_state.wallet_rev = 0
+
+def _wallet():
+    """BSCWallet for this session, connected on first use so pages without RPC calls render at once"""
+    if 'bsc_wallet' not in st.session_state:
+        st.session_state.bsc_wallet = BSCWallet()
+    return st.session_state.bsc_wallet
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _cached_network_info(_bsc_wallet):
+    """Network info, reused across reruns for 5 seconds (about one BSC block)"""
+    return _bsc_wallet.get_network_info()
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _cached_token_info(_bsc_wallet, token_address):
+    """Token info per contract address; name, symbol and decimals never change"""
+    return _bsc_wallet.get_token_info(token_address)
+
+class _UnsettledTransaction(Exception):
+    """Raised out of _final_tx_status so pending or unknown lookups are never cached there"""
+    
+    def __init__(self, tx_info):
+        super().__init__(tx_info['status'])
+        self.tx_info = tx_info
+
+@st.cache_data(ttl=3, max_entries=512, show_spinner=False)
+def _recent_tx_status(_bsc_wallet, tx_hash):
+    """Transaction status, reused for 3 seconds (about one BSC block) while it may still change"""
+    return _bsc_wallet.get_transaction_status(tx_hash)
+
+@st.cache_data(max_entries=4096, show_spinner=False)
+def _final_tx_status(_bsc_wallet, tx_hash):
+    """Status of a mined transaction; its receipt never changes, so it is cached without expiry"""
+    tx_info = _recent_tx_status(_bsc_wallet, tx_hash)
+    if tx_info['status'] not in ("Success", "Failed"):
+        raise _UnsettledTransaction(tx_info)
+    return tx_info
+
+def _tx_status(tx_hash):
+    """Transaction status, read from the mined-transaction cache first"""
+    try:
+        return _final_tx_status(_wallet(), tx_hash)
+    except _UnsettledTransaction as e:
+        return e.tx_info
+
+@st.fragment(run_every=5)
+def _network_metrics(stacked=False):
+    """Live network metrics; every 5 seconds only this fragment reruns, reading the 5 second cache"""
+    try:
+        network_info = _cached_network_info(_wallet())
+    except Exception as e:
+        st.error(f"Failed to get network info: {e}")
+        return
+    
+    connection = "🟢 Connected" if network_info['connected'] else "🔴 Disconnected"
+    chain_id = network_info['chain_id']
+    latest_block = f"{network_info['latest_block']:,}" if network_info['latest_block'] is not None else "N/A"
+    gas_price = f"{network_info['gas_price_gwei']:.2f} gwei"
+    
+    if stacked:
+        st.metric("Connection", connection)
+        st.metric("Chain ID", chain_id)
+        st.metric("Latest Block", latest_block)
+        st.metric("Gas Price", gas_price)
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Chain ID", chain_id)
+        with col2:
+            st.metric("Latest Block", latest_block)
+        with col3:
+            st.metric("Gas Price", gas_price)
+        with col4:
+            st.metric("Status", connection)
 
-def display_wallet_info(wallet_info):
-    """Display wallet information in a nice format"""
+def _set_wallet(wallet_info):
+    """Store the session wallet and bump wallet_rev so display_wallet_info rebuilds its widgets"""
+    st.session_state.wallet = wallet_info
+    st.session_state.wallet_rev += 1
+
+@st.fragment
+def display_wallet_info():
+    """Display the session wallet in a nice format; reruns on its own, not with the page inputs"""
+    wallet_info = st.session_state.wallet
+    if not wallet_info:
+        return
+    
+    # Widget keys change with each new wallet so stale edits are not carried over
+    rev = st.session_state.wallet_rev
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("🔐 Wallet Information")
-        st.text_area("Mnemonic Phrase", wallet_info['mnemonic'], height=80)
-        st.text_input("Address", wallet_info['address'], disabled=True)
-        st.text_input("BIP44 Path", wallet_info['bip44_path'], disabled=True)
+        st.text_area("Mnemonic Phrase", wallet_info['mnemonic'], height=80, key=f"wallet_mnemonic_{rev}")
+        st.text_input("Address", wallet_info['address'], disabled=True, key=f"wallet_address_{rev}")
+        st.text_input("BIP44 Path", wallet_info['bip44_path'], disabled=True, key=f"wallet_path_{rev}")
     
     with col2:
         st.subheader("🔑 Keys")
-        st.text_area("Private Key", wallet_info['private_key'], height=80)
-        st.text_area("Public Key", wallet_info['public_key'], height=80)
+        st.text_area("Private Key", wallet_info['private_key'], height=80, key=f"wallet_private_key_{rev}")
+        st.text_area("Public Key", wallet_info['public_key'], height=80, key=f"wallet_public_key_{rev}")
         
         # QR Code placeholder
         st.info("💡 **Important:** Store your mnemonic and private key securely!")
 
+def display_token_balance(token_balance):
+    """Display one token balance in an expander titled with the contract's name"""
+    with st.expander(f"{token_balance['token_name']}"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Token", token_balance['token_symbol'])
+        with col2:
+            st.metric("Balance", f"{token_balance['balance_formatted']:.6f}")
+        with col3:
+            st.metric("Decimals", token_balance['decimals'])
+        
+        st.code(f"Token Address: {token_balance['token_address']}")
+
+def _go_to(page):
+    """Button callback that switches page before the rerun the click triggers"""
+    st.session_state.current_page = page
+
+def _cancel_confirmation(kind):
+    """Button callback that clears a pending bnb/token send before the fragment reruns"""
+    st.session_state[f"{kind}_confirm_pending"] = False
+    st.session_state[f"{kind}_tx_data"] = {}
+
+def _notify_and_rerun(message):
+    """Keep a success message for the next run and rerun the whole app so output fragments redraw"""
+    st.session_state.notice = message
+    st.rerun()
+
+def _show_notice():
+    """Show and clear the success message left by _notify_and_rerun"""
+    notice = st.session_state.pop('notice', None)
+    if notice:
+        st.success(notice)
+
+@st.fragment
+def _imported_key_output():
+    """Address and public key of a wallet imported from a private key"""
+    if st.session_state.wallet:
+        st.subheader("🔐 Imported Wallet")
+        st.text_input("Address", st.session_state.wallet['address'], disabled=True)
+        st.text_area("Public Key", st.session_state.wallet['public_key'], height=80)
+
+@st.fragment
+def _generate_inputs():
+    """Generate Wallet settings and button"""
+    st.subheader("Settings")
+    strength = st.selectbox(
+        "Mnemonic Strength",
+        [128, 256],
+        format_func=lambda x: f"{x} bits ({'12' if x == 128 else '24'} words)"
+    )
+    
+    if st.button("🎲 Generate Wallet", type="primary"):
+        wallet_info = None
+        with st.spinner("Generating wallet..."):
+            try:
+                wallet_info = _wallet().create_new_wallet(strength)
+            except Exception as e:
+                st.error(f"❌ Error generating wallet: {e}")
+        if wallet_info:
+            _set_wallet(wallet_info)
+            _notify_and_rerun("✅ Wallet generated successfully!")
+    
+    _show_notice()
+
+@st.fragment
+def _import_mnemonic_inputs():
+    """Import from Mnemonic inputs and button"""
+    mnemonic = st.text_area(
+        "Mnemonic Phrase",
+        placeholder="Enter your 12 or 24 word mnemonic phrase...",
+        height=100
+    )
+    
+    account_index = st.number_input(
+        "Account Index (BIP44)",
+        min_value=0,
+        value=0
+    )
+    
+    if st.button("📥 Import from Mnemonic", type="primary") and mnemonic:
+        wallet_info = None
+        with st.spinner("Importing wallet..."):
+            try:
+                wallet_info = _wallet().import_wallet_from_mnemonic(
+                    mnemonic.strip(), account_index
+                )
+            except Exception as e:
+                st.error(f"❌ Error importing wallet: {e}")
+        if wallet_info:
+            _set_wallet(wallet_info)
+            _notify_and_rerun("✅ Wallet imported successfully!")
+    
+    _show_notice()
+
+@st.fragment
+def _import_key_inputs():
+    """Import from Private Key input and button"""
+    private_key = st.text_input(
+        "Private Key",
+        type="password",
+        placeholder="Enter your private key (hex)..."
+    )
+    
+    if st.button("🔑 Import from Private Key", type="primary") and private_key:
+        wallet_info = None
+        with st.spinner("Importing wallet..."):
+            try:
+                wallet_info = _wallet().import_wallet_from_private_key(
+                    private_key.strip()
+                )
+            except Exception as e:
+                st.error(f"❌ Error importing wallet: {e}")
+        if wallet_info:
+            _set_wallet(wallet_info)
+            _notify_and_rerun("✅ Wallet imported successfully!")
+    
+    _show_notice()
+
+@st.fragment
+def _bnb_receipt():
+    """Receipt of the last BNB transfer sent this session"""
+    result = st.session_state.get('bnb_receipt')
+    if not result:
+        return
+    
+    st.subheader("📄 Transaction Receipt")
+    st.text_input("Transaction Hash", result['tx_hash'])
+    st.text_input("From", result['from_address'])
+    st.text_input("To", result['to_address'])
+    st.text_input("Amount", f"{result['amount_bnb']} BNB")
+    
+    if 'status' in result:
+        st.text_input("Status", result['status'])
+        st.text_input("Gas Used", result.get('gas_used', 'N/A'))
+    
+    st.markdown(f"🔍 [View on Explorer]({result['explorer_url']})")
+
+@st.fragment
+def _token_receipt():
+    """Receipt of the last token transfer sent this session"""
+    result = st.session_state.get('token_receipt')
+    if not result:
+        return
+    
+    st.subheader("📄 Transaction Receipt")
+    st.text_input("Transaction Hash", result['tx_hash'])
+    st.text_input("Token", f"{result['token_name']} ({result['token_symbol']})")
+    st.text_input("From", result['from_address'])
+    st.text_input("To", result['to_address'])
+    st.text_input("Amount", f"{result['amount']} {result['token_symbol']}")
+    
+    if 'status' in result:
+        st.text_input("Status", result['status'])
+        st.text_input("Gas Used", result.get('gas_used', 'N/A'))
+    
+    st.markdown(f"🔍 [View on Explorer]({result['explorer_url']})")
+
+@st.fragment
+def _send_bnb_inputs():
+    """Send BNB inputs and confirmation; button clicks rerun only this fragment"""
+    st.subheader("Transaction Details")
+    
+    # A form reruns once on submit rather than on every edit
+    with st.form("send_bnb_form"):
+        private_key = st.text_input(
+            "Private Key",
+            type="password",
+            placeholder="Enter your private key...",
+            value=st.session_state.wallet['private_key'] if st.session_state.wallet else ""
+        )
+        
+        to_address = st.text_input(
+            "Recipient Address",
+            placeholder="Enter recipient address..."
+        )
+        
+        amount = st.number_input(
+            "Amount (BNB)",
+            min_value=0.0,
+            step=0.001,
+            format="%.6f"
+        )
+        
+        wait_confirmation = st.checkbox("Wait for confirmation", value=True)
+        
+        submitted = st.form_submit_button("🚀 Send BNB", type="primary")
+    
+    # Initialize confirmation state
+    if 'bnb_confirm_pending' not in st.session_state:
+        st.session_state.bnb_confirm_pending = False
+    if 'bnb_tx_data' not in st.session_state:
+        st.session_state.bnb_tx_data = {}
+    
+    if submitted and private_key and to_address and amount > 0:
+        # Store transaction data in session state
+        st.session_state.bnb_tx_data = {
+            'private_key': private_key,
+            'to_address': to_address,
+            'amount': amount,
+            'wait_confirmation': wait_confirmation
+        }
+        st.session_state.bnb_confirm_pending = True
+    
+    _show_notice()
+    
+    # Show confirmation dialog if pending
+    if st.session_state.bnb_confirm_pending:
+        st.warning(f"⚠️ You are about to send **{st.session_state.bnb_tx_data['amount']} BNB** to **{st.session_state.bnb_tx_data['to_address']}**")
+        
+        col_confirm, col_cancel = st.columns(2)
+        
+        with col_confirm:
+            if st.button("✅ Confirm Transaction", type="primary"):
+                result = None
+                with st.spinner("Sending transaction..."):
+                    try:
+                        result = _wallet().send_bnb(
+                            st.session_state.bnb_tx_data['private_key'], 
+                            st.session_state.bnb_tx_data['to_address'], 
+                            st.session_state.bnb_tx_data['amount'], 
+                            st.session_state.bnb_tx_data['wait_confirmation']
+                        )
+                    except Exception as e:
+                        st.error(f"❌ Transaction failed: {e}")
+                
+                # Reset confirmation state
+                st.session_state.bnb_confirm_pending = False
+                st.session_state.bnb_tx_data = {}
+                
+                if result:
+                    st.session_state.bnb_receipt = result
+                    _notify_and_rerun("✅ Transaction sent successfully!")
+        
+        with col_cancel:
+            st.button("❌ Cancel", type="secondary", on_click=_cancel_confirmation, args=("bnb",))
+
+@st.fragment
+def _send_tokens_inputs():
+    """Send Tokens inputs and confirmation; button clicks rerun only this fragment"""
+    st.subheader("Transaction Details")
+    
+    # Token selection stays outside the form: it changes which inputs are shown
+    token_option = st.radio(
+        "Token Selection",
+        ["Sample Tokens", "Custom Token"]
+    )
+    
+    if token_option == "Sample Tokens" and HAS_SAMPLE_TOKENS:
+        token_name = st.selectbox("Select Token", SAMPLE_TOKEN_NAMES)
+        token_address = SAMPLE_TOKENS[token_name]
+        st.code(f"Token Address: {token_address}")
+    else:
+        token_address = st.text_input(
+            "Token Contract Address",
+            placeholder="Enter token contract address..."
+        )
+    
+    # Get token info
+    if token_address and st.button("ℹ️ Get Token Info"):
+        try:
+            token_info = _cached_token_info(_wallet(), token_address)
+            st.info(f"Token: {token_info['name']} ({token_info['symbol']}) - {token_info['decimals']} decimals")
+        except Exception as e:
+            st.warning(f"Could not get token info: {e}")
+    
+    # A form reruns once on submit rather than on every edit
+    with st.form("send_tokens_form"):
+        private_key = st.text_input(
+            "Private Key",
+            type="password",
+            placeholder="Enter your private key...",
+            value=st.session_state.wallet['private_key'] if st.session_state.wallet else ""
+        )
+        
+        to_address = st.text_input(
+            "Recipient Address",
+            placeholder="Enter recipient address..."
+        )
+        
+        amount = st.number_input(
+            "Amount",
+            min_value=0.0,
+            step=0.000001,
+            format="%.6f"
+        )
+        
+        wait_confirmation = st.checkbox("Wait for confirmation", value=True)
+        
+        submitted = st.form_submit_button("🪙 Send Tokens", type="primary")
+    
+    # Initialize token confirmation state
+    if 'token_confirm_pending' not in st.session_state:
+        st.session_state.token_confirm_pending = False
+    if 'token_tx_data' not in st.session_state:
+        st.session_state.token_tx_data = {}
+    
+    if submitted and private_key and token_address and to_address and amount > 0:
+        # Store transaction data in session state
+        st.session_state.token_tx_data = {
+            'private_key': private_key,
+            'token_address': token_address,
+            'to_address': to_address,
+            'amount': amount,
+            'wait_confirmation': wait_confirmation
+        }
+        st.session_state.token_confirm_pending = True
+    
+    _show_notice()
+    
+    # Show confirmation dialog if pending
+    if st.session_state.token_confirm_pending:
+        st.warning(f"⚠️ You are about to send **{st.session_state.token_tx_data['amount']} tokens** to **{st.session_state.token_tx_data['to_address']}**")
+        
+        col_confirm, col_cancel = st.columns(2)
+        
+        with col_confirm:
+            if st.button("✅ Confirm Token Transfer", type="primary"):
+                result = None
+                with st.spinner("Sending token transaction..."):
+                    try:
+                        result = _wallet().send_token(
+                            st.session_state.token_tx_data['private_key'], 
+                            st.session_state.token_tx_data['token_address'], 
+                            st.session_state.token_tx_data['to_address'], 
+                            st.session_state.token_tx_data['amount'], 
+                            None, 
+                            st.session_state.token_tx_data['wait_confirmation']
+                        )
+                    except Exception as e:
+                        st.error(f"❌ Token transfer failed: {e}")
+                
+                # Reset confirmation state
+                st.session_state.token_confirm_pending = False
+                st.session_state.token_tx_data = {}
+                
+                if result:
+                    st.session_state.token_receipt = result
+                    _notify_and_rerun("✅ Token transfer sent successfully!")
+        
+        with col_cancel:
+            st.button("❌ Cancel Token Transfer", type="secondary", on_click=_cancel_confirmation, args=("token",))
+
+def send_bnb_page():
+    """Send BNB page; the inputs and the last receipt rerun as separate fragments"""
+    st.header("🚀 Send BNB")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        _send_bnb_inputs()
+    
+    with col2:
+        _bnb_receipt()
+
+def send_tokens_page():
+    """Send Tokens page; the inputs and the last receipt rerun as separate fragments"""
+    st.header("🪙 Send BEP-20 Tokens")
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        _send_tokens_inputs()
+    
+    with col2:
+        _token_receipt()
+
 def main():
     # Title and header
     st.title("💰 BSC Testnet Wallet")
@@ -51,73 +513,56 @@ def main():
     if 'current_page' not in st.session_state:
         st.session_state.current_page = "🏠 Home"
     
-    # Sidebar for navigation
+    # Sidebar for navigation; the selectbox reads and writes current_page itself
     st.sidebar.title("🧭 Navigation")
     page = st.sidebar.selectbox(
         "Choose Operation",
-        ["🏠 Home", "🆕 Generate Wallet", "📥 Import Wallet", "💰 Check Balances", 
-         "🚀 Send BNB", "🪙 Send Tokens", "ℹ️ Network Info"],
-        index=["🏠 Home", "🆕 Generate Wallet", "📥 Import Wallet", "💰 Check Balances", 
-               "🚀 Send BNB", "🪙 Send Tokens", "ℹ️ Network Info"].index(st.session_state.current_page)
+        PAGES,
+        key="current_page"
     )
     
-    # Update session state when selectbox changes
-    if page != st.session_state.current_page:
-        st.session_state.current_page = page
-        st.rerun()
-    
     # Home Page
     if page == "🏠 Home":
         st.header("Welcome to BSC Testnet Wallet")
         
+        # One lookup drives both the connection status and the metrics below
+        try:
+            network_info = _cached_network_info(_wallet())
+            network_error = None
+        except Exception as e:
+            network_info = None
+            network_error = e
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.subheader("🆕 Generate")
             st.write("Create a new wallet with BIP39 mnemonic")
-            if st.button("Generate New Wallet", type="primary"):
-                # Navigate to Generate Wallet page
-                st.session_state.current_page = "🆕 Generate Wallet"
-                st.rerun()
+            # Navigate to Generate Wallet page
+            st.button("Generate New Wallet", type="primary", on_click=_go_to, args=("🆕 Generate Wallet",))
         
         with col2:
             st.subheader("📥 Import")
             st.write("Import existing wallet from mnemonic or private key")
-            if st.button("Import Wallet"):
-                # Navigate to Import Wallet page
-                st.session_state.current_page = "📥 Import Wallet"
-                st.rerun()
+            # Navigate to Import Wallet page
+            st.button("Import Wallet", on_click=_go_to, args=("📥 Import Wallet",))
         
         with col3:
             st.subheader("🔗 Network")
             st.write("BSC Testnet connection status")
-            try:
-                network_info = st.session_state.bsc_wallet.get_network_info()
+            if network_info and network_info['connected']:
                 st.success(f"✅ Connected to Block #{network_info['latest_block']}")
-            except Exception as e:
-                st.error(f"❌ Connection failed: {e}")
+            else:
+                st.error(f"❌ Connection failed: {network_error or 'node did not respond'}")
         
         # Network Information
         st.markdown("---")
         st.subheader("🌐 Network Information")
         
-        try:
-            network_info = st.session_state.bsc_wallet.get_network_info()
-            
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Chain ID", network_info['chain_id'])
-            with col2:
-                st.metric("Latest Block", f"{network_info['latest_block']:,}")
-            with col3:
-                st.metric("Gas Price", f"{network_info['gas_price_gwei']:.2f} gwei")
-            with col4:
-                st.metric("Status", "🟢 Connected" if network_info['connected'] else "🔴 Disconnected")
-            
+        _network_metrics()
+        
+        if network_info:
             st.info(f"🔍 **Explorer:** {network_info['explorer_url']}")
-            
-        except Exception as e:
-            st.error(f"Failed to get network info: {e}")
     
     # Generate Wallet Page
     elif page == "🆕 Generate Wallet":
@@ -126,25 +571,10 @@ def main():
         col1, col2 = st.columns([1, 1])
         
         with col1:
-            st.subheader("Settings")
-            strength = st.selectbox(
-                "Mnemonic Strength",
-                [128, 256],
-                format_func=lambda x: f"{x} bits ({'12' if x == 128 else '24'} words)"
-            )
-            
-            if st.button("🎲 Generate Wallet", type="primary"):
-                with st.spinner("Generating wallet..."):
-                    try:
-                        wallet_info = st.session_state.bsc_wallet.create_new_wallet(strength)
-                        st.session_state.wallet = wallet_info
-                        st.success("✅ Wallet generated successfully!")
-                    except Exception as e:
-                        st.error(f"❌ Error generating wallet: {e}")
+            _generate_inputs()
         
-        if st.session_state.wallet:
-            with col2:
-                display_wallet_info(st.session_state.wallet)
+        with col2:
+            display_wallet_info()
     
     # Import Wallet Page
     elif page == "📥 Import Wallet":
@@ -161,32 +591,10 @@ def main():
             col1, col2 = st.columns([1, 1])
             
             with col1:
-                mnemonic = st.text_area(
-                    "Mnemonic Phrase",
-                    placeholder="Enter your 12 or 24 word mnemonic phrase...",
-                    height=100
-                )
-                
-                account_index = st.number_input(
-                    "Account Index (BIP44)",
-                    min_value=0,
-                    value=0
-                )
-                
-                if st.button("📥 Import from Mnemonic", type="primary") and mnemonic:
-                    with st.spinner("Importing wallet..."):
-                        try:
-                            wallet_info = st.session_state.bsc_wallet.import_wallet_from_mnemonic(
-                                mnemonic.strip(), account_index
-                            )
-                            st.session_state.wallet = wallet_info
-                            st.success("✅ Wallet imported successfully!")
-                        except Exception as e:
-                            st.error(f"❌ Error importing wallet: {e}")
+                _import_mnemonic_inputs()
             
-            if st.session_state.wallet:
-                with col2:
-                    display_wallet_info(st.session_state.wallet)
+            with col2:
+                display_wallet_info()
         
         else:  # From Private Key
             st.subheader("Import from Private Key")
@@ -194,28 +602,10 @@ def main():
             col1, col2 = st.columns([1, 1])
             
             with col1:
-                private_key = st.text_input(
-                    "Private Key",
-                    type="password",
-                    placeholder="Enter your private key (hex)..."
-                )
-                
-                if st.button("🔑 Import from Private Key", type="primary") and private_key:
-                    with st.spinner("Importing wallet..."):
-                        try:
-                            wallet_info = st.session_state.bsc_wallet.import_wallet_from_private_key(
-                                private_key.strip()
-                            )
-                            st.session_state.wallet = wallet_info
-                            st.success("✅ Wallet imported successfully!")
-                        except Exception as e:
-                            st.error(f"❌ Error importing wallet: {e}")
+                _import_key_inputs()
             
-            if st.session_state.wallet:
-                with col2:
-                    st.subheader("🔐 Imported Wallet")
-                    st.text_input("Address", st.session_state.wallet['address'], disabled=True)
-                    st.text_area("Public Key", st.session_state.wallet['public_key'], height=80)
+            with col2:
+                _imported_key_output()
     
     # Check Balances Page
     elif page == "💰 Check Balances":
@@ -228,322 +618,104 @@ def main():
         )
         
         if st.button("🔍 Check Balances", type="primary") and address:
-            with st.spinner("Checking balances..."):
+            balances = None
+            
+            # Status box reports progress; expanders cannot be nested in it, so results render below
+            with st.status("Checking balances...", expanded=False) as status:
                 try:
-                    # BNB Balance
-                    st.subheader("🟡 BNB Balance")
-                    bnb_balance = st.session_state.bsc_wallet.get_bnb_balance(address)
+                    # BNB and all sample token balances in one round-trip
+                    balances = _wallet().get_all_balances(address)
                     
+                    # The fallback lookups return partial results instead of raising
+                    loaded = sum(1 for token_balance in balances['token_balances'].values() if token_balance)
+                    if balances['bnb_balance'] is None:
+                        status.update(label="❌ Could not get BNB balance", state="error")
+                    else:
+                        status.update(label=f"✅ Loaded BNB and {loaded} of {len(SAMPLE_TOKEN_NAMES)} token balances", state="complete")
+                except Exception as e:
+                    status.update(label="❌ Balance lookup failed", state="error")
+                    st.error(f"❌ Error checking balances: {e}")
+            
+            if balances:
+                # BNB Balance
+                st.subheader("🟡 BNB Balance")
+                bnb_balance = balances['bnb_balance']
+                
+                if bnb_balance:
                     col1, col2 = st.columns(2)
                     with col1:
                         st.metric("BNB Balance", f"{bnb_balance['balance_bnb']:.6f} BNB")
                     with col2:
                         st.metric("Balance (Wei)", f"{bnb_balance['balance_wei']:,}")
-                    
-                    # Token Balances
-                    st.subheader("🪙 Token Balances")
-                    
-                    if SAMPLE_TOKENS:
-                        for token_symbol, token_address in SAMPLE_TOKENS.items():
-                            try:
-                                token_balance = st.session_state.bsc_wallet.get_token_balance(
-                                    token_address, address
-                                )
-                                
-                                # Use actual token name from contract instead of symbol
-                                actual_token_name = token_balance['token_name']
-                                
-                                with st.expander(f"{actual_token_name}"):
-                                    col1, col2, col3 = st.columns(3)
-                                    with col1:
-                                        st.metric("Token", token_balance['token_symbol'])
-                                    with col2:
-                                        st.metric("Balance", f"{token_balance['balance_formatted']:.6f}")
-                                    with col3:
-                                        st.metric("Decimals", token_balance['decimals'])
-                                    
-                                    st.code(f"Token Address: {token_balance['token_address']}")
-                                    
-                            except Exception as e:
-                                st.warning(f"Could not get {token_symbol} balance: {e}")
-                    else:
-                        st.info("No sample tokens configured")
-                        
-                except Exception as e:
-                    st.error(f"❌ Error checking balances: {e}")
+                else:
+                    st.warning("Could not get BNB balance")
+                
+                # Token Balances
+                st.subheader("🪙 Token Balances")
+                
+                if HAS_SAMPLE_TOKENS:
+                    for token_symbol in SAMPLE_TOKEN_NAMES:
+                        token_balance = balances['token_balances'].get(token_symbol)
+                        if token_balance:
+                            display_token_balance(token_balance)
+                        else:
+                            st.warning(f"Could not get {token_symbol} balance")
+                else:
+                    st.info("No sample tokens configured")
     
     # Send BNB Page
     elif page == "🚀 Send BNB":
-        st.header("🚀 Send BNB")
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.subheader("Transaction Details")
-            
-            private_key = st.text_input(
-                "Private Key",
-                type="password",
-                placeholder="Enter your private key...",
-                value=st.session_state.wallet['private_key'] if st.session_state.wallet else ""
-            )
-            
-            to_address = st.text_input(
-                "Recipient Address",
-                placeholder="Enter recipient address..."
-            )
-            
-            amount = st.number_input(
-                "Amount (BNB)",
-                min_value=0.0,
-                step=0.001,
-                format="%.6f"
-            )
-            
-            wait_confirmation = st.checkbox("Wait for confirmation", value=True)
-            
-            # Initialize confirmation state
-            if 'bnb_confirm_pending' not in st.session_state:
-                st.session_state.bnb_confirm_pending = False
-            if 'bnb_tx_data' not in st.session_state:
-                st.session_state.bnb_tx_data = {}
-            
-            if st.button("🚀 Send BNB", type="primary") and private_key and to_address and amount > 0:
-                # Store transaction data in session state
-                st.session_state.bnb_tx_data = {
-                    'private_key': private_key,
-                    'to_address': to_address,
-                    'amount': amount,
-                    'wait_confirmation': wait_confirmation
-                }
-                st.session_state.bnb_confirm_pending = True
-                st.rerun()
-            
-            # Show confirmation dialog if pending
-            if st.session_state.bnb_confirm_pending:
-                st.warning(f"⚠️ You are about to send **{st.session_state.bnb_tx_data['amount']} BNB** to **{st.session_state.bnb_tx_data['to_address']}**")
-                
-                col_confirm, col_cancel = st.columns(2)
-                
-                with col_confirm:
-                    if st.button("✅ Confirm Transaction", type="primary"):
-                        with st.spinner("Sending transaction..."):
-                            try:
-                                result = st.session_state.bsc_wallet.send_bnb(
-                                    st.session_state.bnb_tx_data['private_key'], 
-                                    st.session_state.bnb_tx_data['to_address'], 
-                                    st.session_state.bnb_tx_data['amount'], 
-                                    st.session_state.bnb_tx_data['wait_confirmation']
-                                )
-                                
-                                st.success("✅ Transaction sent successfully!")
-                                
-                                with col2:
-                                    st.subheader("📄 Transaction Receipt")
-                                    st.text_input("Transaction Hash", result['tx_hash'])
-                                    st.text_input("From", result['from_address'])
-                                    st.text_input("To", result['to_address'])
-                                    st.text_input("Amount", f"{result['amount_bnb']} BNB")
-                                    
-                                    if 'status' in result:
-                                        st.text_input("Status", result['status'])
-                                        st.text_input("Gas Used", result.get('gas_used', 'N/A'))
-                                    
-                                    st.markdown(f"🔍 [View on Explorer]({result['explorer_url']})")
-                                
-                                # Reset confirmation state
-                                st.session_state.bnb_confirm_pending = False
-                                st.session_state.bnb_tx_data = {}
-                                    
-                            except Exception as e:
-                                st.error(f"❌ Transaction failed: {e}")
-                                # Reset confirmation state on error
-                                st.session_state.bnb_confirm_pending = False
-                                st.session_state.bnb_tx_data = {}
-                
-                with col_cancel:
-                    if st.button("❌ Cancel", type="secondary"):
-                        st.session_state.bnb_confirm_pending = False
-                        st.session_state.bnb_tx_data = {}
-                        st.rerun()
+        send_bnb_page()
     
     # Send Tokens Page
     elif page == "🪙 Send Tokens":
-        st.header("🪙 Send BEP-20 Tokens")
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.subheader("Transaction Details")
-            
-            private_key = st.text_input(
-                "Private Key",
-                type="password",
-                placeholder="Enter your private key...",
-                value=st.session_state.wallet['private_key'] if st.session_state.wallet else ""
-            )
-            
-            # Token selection
-            token_option = st.radio(
-                "Token Selection",
-                ["Sample Tokens", "Custom Token"]
-            )
-            
-            if token_option == "Sample Tokens" and SAMPLE_TOKENS:
-                token_name = st.selectbox("Select Token", list(SAMPLE_TOKENS.keys()))
-                token_address = SAMPLE_TOKENS[token_name]
-                st.code(f"Token Address: {token_address}")
-            else:
-                token_address = st.text_input(
-                    "Token Contract Address",
-                    placeholder="Enter token contract address..."
-                )
-            
-            to_address = st.text_input(
-                "Recipient Address",
-                placeholder="Enter recipient address..."
-            )
-            
-            amount = st.number_input(
-                "Amount",
-                min_value=0.0,
-                step=0.000001,
-                format="%.6f"
-            )
-            
-            wait_confirmation = st.checkbox("Wait for confirmation", value=True)
-            
-            # Get token info
-            if token_address and st.button("ℹ️ Get Token Info"):
-                try:
-                    token_info = st.session_state.bsc_wallet.get_token_info(token_address)
-                    st.info(f"Token: {token_info['name']} ({token_info['symbol']}) - {token_info['decimals']} decimals")
-                except Exception as e:
-                    st.warning(f"Could not get token info: {e}")
-            
-            # Initialize token confirmation state
-            if 'token_confirm_pending' not in st.session_state:
-                st.session_state.token_confirm_pending = False
-            if 'token_tx_data' not in st.session_state:
-                st.session_state.token_tx_data = {}
-            
-            if st.button("🪙 Send Tokens", type="primary") and private_key and token_address and to_address and amount > 0:
-                # Store transaction data in session state
-                st.session_state.token_tx_data = {
-                    'private_key': private_key,
-                    'token_address': token_address,
-                    'to_address': to_address,
-                    'amount': amount,
-                    'wait_confirmation': wait_confirmation
-                }
-                st.session_state.token_confirm_pending = True
-                st.rerun()
-            
-            # Show confirmation dialog if pending
-            if st.session_state.token_confirm_pending:
-                st.warning(f"⚠️ You are about to send **{st.session_state.token_tx_data['amount']} tokens** to **{st.session_state.token_tx_data['to_address']}**")
-                
-                col_confirm, col_cancel = st.columns(2)
-                
-                with col_confirm:
-                    if st.button("✅ Confirm Token Transfer", type="primary"):
-                        with st.spinner("Sending token transaction..."):
-                            try:
-                                result = st.session_state.bsc_wallet.send_token(
-                                    st.session_state.token_tx_data['private_key'], 
-                                    st.session_state.token_tx_data['token_address'], 
-                                    st.session_state.token_tx_data['to_address'], 
-                                    st.session_state.token_tx_data['amount'], 
-                                    None, 
-                                    st.session_state.token_tx_data['wait_confirmation']
-                                )
-                                
-                                st.success("✅ Token transfer sent successfully!")
-                                
-                                with col2:
-                                    st.subheader("📄 Transaction Receipt")
-                                    st.text_input("Transaction Hash", result['tx_hash'])
-                                    st.text_input("Token", f"{result['token_name']} ({result['token_symbol']})")
-                                    st.text_input("From", result['from_address'])
-                                    st.text_input("To", result['to_address'])
-                                    st.text_input("Amount", f"{result['amount']} {result['token_symbol']}")
-                                    
-                                    if 'status' in result:
-                                        st.text_input("Status", result['status'])
-                                        st.text_input("Gas Used", result.get('gas_used', 'N/A'))
-                                    
-                                    st.markdown(f"🔍 [View on Explorer]({result['explorer_url']})")
-                                
-                                # Reset confirmation state
-                                st.session_state.token_confirm_pending = False
-                                st.session_state.token_tx_data = {}
-                                    
-                            except Exception as e:
-                                st.error(f"❌ Token transfer failed: {e}")
-                                # Reset confirmation state on error
-                                st.session_state.token_confirm_pending = False
-                                st.session_state.token_tx_data = {}
-                
-                with col_cancel:
-                    if st.button("❌ Cancel Token Transfer", type="secondary"):
-                        st.session_state.token_confirm_pending = False
-                        st.session_state.token_tx_data = {}
-                        st.rerun()
+        send_tokens_page()
     
     # Network Info Page
     elif page == "ℹ️ Network Info":
         st.header("ℹ️ Network Information")
         
-        try:
-            network_info = st.session_state.bsc_wallet.get_network_info()
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("🌐 Network Status")
-                st.metric("Connection", "🟢 Connected" if network_info['connected'] else "🔴 Disconnected")
-                st.metric("Chain ID", network_info['chain_id'])
-                st.metric("Latest Block", f"{network_info['latest_block']:,}")
-                st.metric("Gas Price", f"{network_info['gas_price_gwei']:.2f} gwei")
-            
-            with col2:
-                st.subheader("🔗 Links")
-                st.markdown(f"**Explorer:** [BSCScan Testnet]({network_info['explorer_url']})")
-                st.markdown("**Faucet:** [BSC Testnet Faucet](https://testnet.binance.org/faucet-smart)")
-                st.markdown("**RPC URL:** `https://data-seed-prebsc-1-s1.binance.org:8545/`")
-            
-            # Sample tokens
-            st.subheader("🪙 Sample Token Addresses")
-            if SAMPLE_TOKENS:
-                for name, address in SAMPLE_TOKENS.items():
-                    st.code(f"{name}: {address}")
-            else:
-                st.info("No sample tokens configured")
-            
-            # Transaction lookup
-            st.subheader("🔍 Transaction Lookup")
-            tx_hash = st.text_input("Transaction Hash", placeholder="Enter transaction hash...")
-            
-            if st.button("🔍 Check Transaction") and tx_hash:
-                try:
-                    tx_info = st.session_state.bsc_wallet.get_transaction_status(tx_hash)
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Status", tx_info['status'])
-                        if tx_info.get('block_number'):
-                            st.metric("Block Number", tx_info['block_number'])
-                    
-                    with col2:
-                        if tx_info.get('gas_used'):
-                            st.metric("Gas Used", f"{tx_info['gas_used']:,}")
-                        st.markdown(f"🔍 [View on Explorer]({tx_info['explorer_url']})")
-                        
-                except Exception as e:
-                    st.error(f"Error checking transaction: {e}")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("🌐 Network Status")
+            _network_metrics(stacked=True)
+        
+        with col2:
+            st.subheader("🔗 Links")
+            st.markdown(f"**Explorer:** [BSCScan Testnet]({BSC_TESTNET_EXPLORER})")
+            st.markdown("**Faucet:** [BSC Testnet Faucet](https://testnet.binance.org/faucet-smart)")
+            st.markdown("**RPC URL:** `https://data-seed-prebsc-1-s1.binance.org:8545/`")
+        
+        # Sample tokens
+        st.subheader("🪙 Sample Token Addresses")
+        if HAS_SAMPLE_TOKENS:
+            for name, address in SAMPLE_TOKEN_ITEMS:
+                st.code(f"{name}: {address}")
+        else:
+            st.info("No sample tokens configured")
+        
+        # Transaction lookup
+        st.subheader("🔍 Transaction Lookup")
+        tx_hash = st.text_input("Transaction Hash", placeholder="Enter transaction hash...")
+        
+        if st.button("🔍 Check Transaction") and tx_hash:
+            try:
+                tx_info = _tx_status(tx_hash.strip())
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Status", tx_info['status'])
+                    if tx_info.get('block_number'):
+                        st.metric("Block Number", tx_info['block_number'])
+                
+                with col2:
+                    if tx_info.get('gas_used'):
+                        st.metric("Gas Used", f"{tx_info['gas_used']:,}")
+                    st.markdown(f"🔍 [View on Explorer]({tx_info['explorer_url']})")
                     
-        except Exception as e:
-            st.error(f"Failed to get network info: {e}")
+            except Exception as e:
+                st.error(f"Error checking transaction: {e}")
     
     # Footer
     st.markdown("---")